@@ -0,0 +1,76 @@
+"""Compare memory and throughput of FTLDocument and CompactDocument.
+
+Builds ``--documents`` synthetic documents in each representation, then
+reports the memory they hold and how fast they can be built and validated.
+
+    python benchmarks/bench_compact.py --documents 100000
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from ftl_document.compact import CompactDocument
+from ftl_document.core import FTLDocument
+from ftl_document.validator import DocumentValidator
+
+from bench_index import make_document
+
+
+def build(cls, rows):
+    """Build one document per row of field data."""
+    if cls is CompactDocument:
+        return [CompactDocument.from_dict(row) for row in rows]
+    return [FTLDocument.model_validate(row) for row in rows]
+
+
+def measure(label: str, cls, rows, validator: DocumentValidator) -> None:
+    """Print memory held, build rate and validation rate for one representation."""
+    gc.collect()
+    tracemalloc.start()
+    documents = build(cls, rows)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del documents
+    gc.collect()
+
+    start = time.perf_counter()
+    documents = build(cls, rows)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for document in documents:
+        validator.validate(document)
+    validate_time = time.perf_counter() - start
+
+    count = len(rows)
+    print(
+        f"  {label:<16} {held / count:8.0f} B/doc  "
+        f"{count / build_time:10.0f} builds/s  "
+        f"{count / validate_time:10.0f} validations/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=100000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    # Fresh strings per row, as they would be after decoding JSON from disk
+    rows = [
+        json.loads(make_document(i, rng).model_dump_json())
+        for i in range(args.documents)
+    ]
+    validator = DocumentValidator()
+
+    print(f"{args.documents} documents")
+    measure("FTLDocument", FTLDocument, rows, validator)
+    measure("CompactDocument", CompactDocument, rows, validator)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark streaming DOCX ingestion on large documents.
+
+Generates a synthetic DOCX whose ``word/document.xml`` is ``--size-mb``
+megabytes (uncompressed), then converts it with ``iter_docx_markdown`` and
+reports throughput and peak traced memory. Peak memory should stay roughly
+constant as the document size grows.
+
+    python benchmarks/bench_docx.py --size-mb 100 --size-mb 200
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+from ftl_document.docx_reader import iter_docx_markdown
+
+NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+BLOCK = (
+    '<w:p><w:pPr><w:pStyle w:val="Heading2"/></w:pPr><w:r><w:t>Section {i}</w:t></w:r></w:p>'
+    '<w:p><w:r><w:rPr><w:b/></w:rPr><w:t>Install the package and configure the service '
+    "so that it starts at boot.</w:t></w:r></w:p>"
+    '<w:p><w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr></w:pPr>'
+    "<w:r><w:t>Run systemctl enable --now service-{i}</w:t></w:r></w:p>"
+    "<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Port</w:t></w:r></w:p></w:tc>"
+    "<w:tc><w:p><w:r><w:t>{i}</w:t></w:r></w:p></w:tc></w:tr></w:tbl>"
+    "<w:p><w:r><w:drawing><w:t>image</w:t></w:drawing></w:r></w:p>"
+)
+
+
+def make_docx(path: str, size_mb: int) -> None:
+    """Write a DOCX whose document part is roughly size_mb megabytes."""
+    target = size_mb * 1024 * 1024
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("word/document.xml", "w", force_zip64=True) as stream:
+            stream.write(f"<w:document {NS}><w:body>".encode())
+            written = 0
+            i = 0
+            while written < target:
+                chunk = "".join(BLOCK.format(i=i + n) for n in range(1000)).encode()
+                stream.write(chunk)
+                written += len(chunk)
+                i += 1000
+            stream.write(b"<w:sectPr/></w:body></w:document>")
+
+
+def convert(path: str) -> "tuple[int, int]":
+    """Stream a document through the converter, counting lines and characters."""
+    lines = 0
+    chars = 0
+    for line in iter_docx_markdown(path):
+        lines += 1
+        chars += len(line)
+    return lines, chars
+
+
+def run(size_mb: int, memory: bool) -> None:
+    """Convert a generated document and print timing and memory figures."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.docx")
+        make_docx(path, size_mb)
+
+        start = time.perf_counter()
+        lines, chars = convert(path)
+        elapsed = time.perf_counter() - start
+        report = (
+            f"{size_mb:>5} MB xml: {elapsed:7.2f}s {size_mb / elapsed:7.2f} MB/s "
+            f"{lines} lines {chars} chars"
+        )
+
+        # tracemalloc slows conversion considerably, so measure it separately
+        if memory:
+            tracemalloc.start()
+            convert(path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report += f" peak={peak / 1024 / 1024:.2f} MB"
+
+    print(report)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, action="append")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the tracemalloc pass"
+    )
+    args = parser.parse_args()
+    for size_mb in args.size_mb or [10, 100]:
+        run(size_mb, memory=not args.no_memory)
+
+
+if __name__ == "__main__":
+    main()
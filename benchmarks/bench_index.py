@@ -0,0 +1,90 @@
+"""Benchmark the document index on a large synthetic corpus.
+
+Builds an index of ``--documents`` generated FTL documents, then times
+typical lookups: by tool, by dependency prefix, full-text and combined.
+
+    python benchmarks/bench_index.py --documents 100000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from ftl_document.core import FTLDocument
+from ftl_document.index import DocumentIndex
+
+TOOLS = [
+    "apt_tool", "dnf_tool", "bash_tool", "firewalld_tool", "user_tool",
+    "copy_tool", "git_tool", "hostname_tool", "lineinfile_tool", "service_tool",
+]
+DEPENDENCIES = [
+    "Python 3.8+", "Python 3.10", "SSH access", "Root access", "Java 17+",
+    "Ubuntu 22.04", "RHEL 9", "Docker", "Internet connection", "2GB RAM",
+]
+PACKAGES = ["nginx", "postgresql", "redis", "minecraft", "haproxy", "grafana"]
+
+
+def make_document(i: int, rng: random.Random) -> FTLDocument:
+    """Generate a plausible FTL document."""
+    package = rng.choice(PACKAGES)
+    return FTLDocument(
+        title=f"Install and configure {package} #{i}",
+        dependencies=rng.sample(DEPENDENCIES, 3),
+        tools_required=rng.sample(TOOLS, 4),
+        questions=[f"Which port should {package} listen on?"],
+        implementation_steps=[
+            f"1. Install the {package} package",
+            f"2. Write the {package} configuration file",
+            f"3. Enable and start the {package} service",
+        ],
+        verification_steps=[f"- Check that {package} is running"],
+        produces=[f"A running {package} service"],
+    )
+
+
+def timed(label: str, fn, repeat: int = 20) -> None:
+    """Run fn repeatedly and print the mean latency."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<40} {elapsed * 1000:8.2f} ms  ({len(results)} results)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with DocumentIndex(os.path.join(tmp, "index.db")) as index:
+            start = time.perf_counter()
+            index.add_many(
+                (make_document(i, rng), f"/corpus/doc-{i}.md")
+                for i in range(args.documents)
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"Indexed {len(index)} documents in {elapsed:.1f}s "
+                f"({args.documents / elapsed:.0f} docs/s)"
+            )
+
+            limit = args.limit
+            timed("tool = firewalld_tool", lambda: index.search(tools=["firewalld_tool"], limit=limit))
+            timed("dependency prefix python 3*", lambda: index.search(dependencies=["python 3*"], limit=limit))
+            timed("full text 'redis'", lambda: index.search("redis", limit=limit))
+            timed(
+                "text + tool + dependency",
+                lambda: index.search(
+                    "grafana", tools=["git_tool"], dependencies=["Docker"], limit=limit
+                ),
+            )
+            timed("tool, unlimited", lambda: index.search(tools=["apt_tool"], limit=None), repeat=3)
+
+
+if __name__ == "__main__":
+    main()
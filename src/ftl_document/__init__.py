@@ -8,12 +8,16 @@ __author__ = "FTL Team"
 __email__ = "team@ftl.dev"
 
 from .core import FTLDocument, DocumentParser
+from .compact import CompactDocument
 from .generator import DocumentGenerator
 from .validator import DocumentValidator
+from .index import DocumentIndex
 
 __all__ = [
     "FTLDocument",
+    "CompactDocument",
     "DocumentParser",
     "DocumentGenerator",
     "DocumentValidator",
+    "DocumentIndex",
 ]
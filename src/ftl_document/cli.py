@@ -1,30 +1,86 @@
 """Command line interface for ftl-document."""
 
+import hashlib
+import os
+import re
+import sys
 import click
 import requests
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
 from .core import DocumentParser, FTLDocument
 from .generator import DocumentGenerator
 from .validator import DocumentValidator, ValidationError
+from .journal import JobJournal
+from .index import DocumentIndex
+from .tracing import get_tracer, profile
+from .serialization import format_for_path, iter_jsonl, load_document, write_jsonl
+from .streams import CHUNK_SIZE, STDIN, iter_chunks, iter_file_chunks
 
 import litellm
-litellm._turn_on_debug()
+
+
+def hedge_options(command):
+    """Add the request hedging options shared by generate and batch."""
+    options = [
+        click.option(
+            "--hedge-model",
+            default=None,
+            help="Secondary model to race against slow responses from --model",
+        ),
+        click.option(
+            "--hedge-percentile",
+            type=click.FloatRange(0, 100),
+            default=95.0,
+            show_default=True,
+            help="Hedge requests slower than this percentile of recent latencies",
+        ),
+        click.option(
+            "--hedge-delay",
+            type=click.FloatRange(min=0),
+            default=30.0,
+            show_default=True,
+            help="Seconds to wait before hedging until enough latencies are sampled",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def _report_hedging(parser: DocumentParser, err: bool = False) -> None:
+    """Print hedging statistics for the requests made by parser."""
+    service = parser.llm_service
+    if not service.hedge_model:
+        return
+    stats = service.hedge_stats
+    click.echo(
+        f"Hedged {stats['hedged']} of {stats['requests']} request(s) "
+        f"({service.hedge_rate:.0%}); hedge won {stats['hedge_wins']}, "
+        f"saving at least {stats['latency_saved']:.1f}s",
+        err=err,
+    )
 
 
 @click.group()
 @click.version_option(version="0.1.0")
-def main() -> None:
+@click.option("--debug", is_flag=True, help="Enable litellm debug logging")
+def main(debug: bool) -> None:
     """FTL Document Generator - Convert documentation to FTL format."""
-    pass
+    if debug:
+        litellm._turn_on_debug()
 
 
 @main.command()
 @click.argument("input_source", type=str)
 @click.option(
-    "--output", "-o", type=click.Path(path_type=Path), help="Output file path"
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path),
+    help="Output file path (default: stdout)",
 )
 @click.option(
     "--format",
@@ -33,6 +89,13 @@ def main() -> None:
     default="markdown",
     help="Output format",
 )
+@click.option(
+    "--input-format",
+    "-i",
+    type=click.Choice(["ftl", "markdown", "html", "text", "docx"]),
+    default=None,
+    help="Input format (detected from content when omitted)",
+)
 @click.option(
     "--validate/--no-validate",
     default=True,
@@ -44,39 +107,114 @@ def main() -> None:
     default="claude-sonnet-4-20250514",
     help="LLM model to use for transformation",
 )
+@hedge_options
+@click.option(
+    "--trace-file",
+    type=click.Path(path_type=Path),
+    help="Append OTLP/JSON trace spans for the run to this file",
+)
+@click.option(
+    "--trace-endpoint",
+    default=None,
+    help="OTLP/HTTP collector URL to send trace spans to (e.g. .../v1/traces)",
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    type=click.Path(path_type=Path),
+    help="Write cProfile and tracemalloc reports to PATH.prof and PATH.txt",
+)
+@click.option(
+    "--index",
+    "index_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Add the generated document to this search index",
+)
 def generate(
     input_source: str,
     output: Optional[Path],
     format: str,
+    input_format: Optional[str],
     validate: bool,
     model: str,
+    hedge_model: Optional[str],
+    hedge_percentile: float,
+    hedge_delay: float,
+    trace_file: Optional[Path],
+    trace_endpoint: Optional[str],
+    profile_path: Optional[Path],
+    index_path: Optional[Path],
 ) -> None:
-    """Generate FTL document from input file or URL."""
+    """Generate FTL document from input file, URL or - for stdin."""
+    if index_path and (output is None or str(output) == STDIN):
+        raise click.UsageError("--index requires --output to name a file to index")
+    tracer = get_tracer()
+    tracer.enabled = bool(trace_file or trace_endpoint or profile_path)
     try:
-        # Determine if input is URL or file path
-        parsed_url = urlparse(input_source)
-        if parsed_url.scheme in ("http", "https"):
-            # Fetch content from URL
-            click.echo(f"Fetching content from URL: {input_source}")
+        with ExitStack() as stack:
+            if profile_path:
+                stack.enter_context(profile(str(profile_path)))
+            stack.enter_context(tracer.span("generate", input=input_source))
+            _generate(
+                input_source,
+                output,
+                format,
+                input_format,
+                validate,
+                model,
+                hedge_model,
+                hedge_percentile,
+                hedge_delay,
+                index_path,
+            )
+    finally:
+        if profile_path:
+            for name, seconds in tracer.summary().items():
+                click.echo(f"{name}: {seconds:.3f}s", err=True)
+        if trace_file:
+            tracer.export_file(str(trace_file))
+        if trace_endpoint:
             try:
-                response = requests.get(input_source, timeout=30)
-                response.raise_for_status()
-                content = response.text
+                tracer.export_collector(trace_endpoint)
             except requests.exceptions.RequestException as e:
-                click.echo(f"Error fetching URL: {e}", err=True)
-                raise click.Abort()
-        else:
-            # Read from file path
-            input_file = Path(input_source)
-            if not input_file.exists():
-                click.echo(f"Error: File not found: {input_source}", err=True)
-                raise click.Abort()
-            content = input_file.read_text(encoding="utf-8")
+                click.echo(f"Error exporting trace: {e}", err=True)
 
-        # Parse content using LLM
-        parser = DocumentParser(model=model)
-        click.echo(f"Transforming document using {model}...")
-        document = parser.auto_parse(content)
+
+def _generate(
+    input_source: str,
+    output: Optional[Path],
+    format: str,
+    input_format: Optional[str],
+    validate: bool,
+    model: str,
+    hedge_model: Optional[str],
+    hedge_percentile: float,
+    hedge_delay: float,
+    index_path: Optional[Path],
+) -> None:
+    """Run the generate pipeline, recording a span for each stage."""
+    tracer = get_tracer()
+    try:
+        # Keep stdout for the document itself when writing it there
+        to_stdout = output is None or str(output) == STDIN
+        parser = DocumentParser(
+            model=model,
+            hedge_model=hedge_model,
+            hedge_percentile=hedge_percentile,
+            hedge_delay=hedge_delay,
+        )
+        try:
+            document = _load_document(
+                parser, input_source, input_format, err=to_stdout
+            )
+        except requests.exceptions.RequestException as e:
+            click.echo(f"Error fetching URL: {e}", err=True)
+            raise click.Abort()
+        except FileNotFoundError as e:
+            click.echo(f"Error: {e}", err=True)
+            raise click.Abort()
+        finally:
+            _report_hedging(parser, err=to_stdout)
 
         # Validate if requested
         if validate:
@@ -91,27 +229,39 @@ def generate(
                 raise click.Abort()
 
             if results["warnings"]:
-                click.echo(f"Validation warnings ({len(results['warnings'])}):")
+                click.echo(
+                    f"Validation warnings ({len(results['warnings'])}):", err=to_stdout
+                )
                 for warning in results["warnings"]:
-                    click.echo(f"  - {warning}")
+                    click.echo(f"  - {warning}", err=to_stdout)
 
-            click.echo(f"Document quality score: {results['score']}/100")
+            click.echo(
+                f"Document quality score: {results['score']}/100", err=to_stdout
+            )
 
         # Generate output
         generator = DocumentGenerator()
 
-        if output:
+        if not to_stdout:
             generator.save_to_file(document, str(output), format)
             click.echo(f"Generated FTL document: {output}")
+            if index_path:
+                with tracer.span("index", path=str(output)):
+                    with DocumentIndex(str(index_path)) as index:
+                        index.add(document, str(output))
         else:
-            # Output to stdout
-            if format == "markdown":
-                content = generator.generate_markdown(document)
-            elif format == "json":
-                content = generator.generate_json(document)
-            else:  # yaml
-                content = generator.generate_yaml(document)
-            click.echo(content)
+            # Output to stdout, section by section
+            with tracer.span("write", path=STDIN):
+                try:
+                    with click.open_file(STDIN, "w") as stdout:
+                        generator.write(document, stdout, format)
+                        stdout.write("\n")
+                        stdout.flush()
+                except BrokenPipeError:
+                    # The reader (e.g. head) exited early; stop quietly
+                    devnull = os.open(os.devnull, os.O_WRONLY)
+                    os.dup2(devnull, sys.stdout.fileno())
+                    sys.exit(1)
 
     except NotImplementedError as e:
         click.echo(f"Error: {e}", err=True)
@@ -125,6 +275,437 @@ def generate(
         raise click.Abort()
 
 
+def _load_document(
+    parser: DocumentParser,
+    input_source: str,
+    input_format: Optional[str],
+    err: bool = False,
+) -> FTLDocument:
+    """Read a file, URL or - (stdin) and convert it to an FTL document.
+
+    Input is read in chunks and preprocessed as it arrives. Status messages
+    go to stderr when err is set, keeping stdout free for the document.
+    """
+    tracer = get_tracer()
+    docx_path: Optional[str] = None
+    encoding = "utf-8"
+
+    with ExitStack() as stack:
+        # Determine if input is URL, stdin or file path
+        parsed_url = urlparse(input_source)
+        if parsed_url.scheme in ("http", "https"):
+            # Fetch content from URL, reading the body as it is parsed
+            click.echo(f"Fetching content from URL: {input_source}", err=err)
+            with tracer.span("fetch", url=input_source):
+                response = stack.enter_context(
+                    requests.get(input_source, timeout=30, stream=True)
+                )
+                response.raise_for_status()
+            chunks = tracer.iter_span(
+                "fetch", response.iter_content(CHUNK_SIZE), url=input_source
+            )
+            encoding = response.encoding or encoding
+        elif input_source == STDIN:
+            stdin = stack.enter_context(click.open_file(STDIN, "rb"))
+            chunks = tracer.iter_span("fetch", iter_chunks(stdin), path=STDIN)
+        else:
+            # Read from file path
+            input_file = Path(input_source)
+            if not input_file.exists():
+                raise FileNotFoundError(f"File not found: {input_source}")
+            if input_format == "docx" or input_file.suffix.lower() == ".docx":
+                # Binary format; streamed by the parser rather than read here
+                docx_path = input_source
+            else:
+                chunks = tracer.iter_span(
+                    "fetch", iter_file_chunks(input_source), path=input_source
+                )
+
+        # Parse content using LLM
+        click.echo(
+            f"Transforming document using {parser.llm_service.model}...", err=err
+        )
+        if docx_path:
+            return parser.parse_docx(docx_path)
+
+        skipped = parser.llm_calls_skipped
+        document = parser.parse_chunks(chunks, input_format, encoding)
+        if parser.llm_calls_skipped > skipped:
+            click.echo("Input is already an FTL document; skipped the LLM", err=err)
+        return document
+
+
+OUTPUT_SUFFIXES = {"markdown": ".md", "json": ".json", "yaml": ".yaml"}
+
+
+def _slugify(text: str) -> str:
+    """Turn arbitrary text into a safe file name stem."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", text).strip("-.") or "document"
+
+
+def _output_paths(
+    sources: List[str],
+    output_dir: Path,
+    format: str,
+    taken: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """Choose an output file in output_dir for each input source.
+
+    taken maps sources to output paths already assigned (e.g. by the run
+    being resumed), so new sources do not overwrite their outputs.
+    """
+    paths: Dict[str, str] = {}
+    used: Dict[str, str] = {
+        Path(path).stem: source for source, path in (taken or {}).items()
+    }
+    for source in sources:
+        parsed_url = urlparse(source)
+        if parsed_url.scheme in ("http", "https"):
+            stem = Path(parsed_url.path).stem or parsed_url.netloc
+        else:
+            stem = Path(source).stem
+        stem = _slugify(stem)
+        if stem in used and used[stem] != source:
+            # Keep names stable across runs when two inputs share a stem
+            stem = f"{stem}-{hashlib.sha1(source.encode('utf-8')).hexdigest()[:8]}"
+        used[stem] = source
+        paths[source] = str(output_dir / f"{stem}{OUTPUT_SUFFIXES[format]}")
+    return paths
+
+
+@main.command()
+@click.argument("input_sources", nargs=-1, type=str)
+@click.option(
+    "--output-dir",
+    "-d",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Directory to write generated documents to",
+)
+@click.option(
+    "--format",
+    "-f",
+    type=click.Choice(["markdown", "json", "yaml"]),
+    default="markdown",
+    help="Output format",
+)
+@click.option(
+    "--validate/--no-validate",
+    default=True,
+    help="Validate generated documents",
+)
+@click.option(
+    "--model",
+    "-m",
+    default="claude-sonnet-4-20250514",
+    help="LLM model to use for transformation",
+)
+@hedge_options
+@click.option(
+    "--journal",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Job journal database (default: OUTPUT_DIR/.ftl-journal.db)",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue the previous run recorded in the journal",
+)
+@click.option(
+    "--index",
+    "index_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Add generated documents to this search index",
+)
+def batch(
+    input_sources: Tuple[str, ...],
+    output_dir: Path,
+    format: str,
+    validate: bool,
+    model: str,
+    hedge_model: Optional[str],
+    hedge_percentile: float,
+    hedge_delay: float,
+    journal: Optional[Path],
+    resume: bool,
+    index_path: Optional[Path],
+) -> None:
+    """Generate FTL documents for many files or URLs, resumably."""
+    if not input_sources and not resume:
+        raise click.UsageError("Provide input sources or --resume")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    journal_path = journal or output_dir / ".ftl-journal.db"
+    # One parser for the whole run, so hedging learns from its latencies
+    parser = DocumentParser(
+        model=model,
+        hedge_model=hedge_model,
+        hedge_percentile=hedge_percentile,
+        hedge_delay=hedge_delay,
+    )
+    validator = DocumentValidator()
+    generator = DocumentGenerator()
+
+    with ExitStack() as stack:
+        jobs = stack.enter_context(JobJournal(str(journal_path)))
+        index = (
+            stack.enter_context(DocumentIndex(str(index_path))) if index_path else None
+        )
+        if resume:
+            journaled_format = jobs.get_meta("format")
+            if journaled_format and journaled_format != format:
+                # Outputs already written and journaled use the original format
+                raise click.UsageError(
+                    f"The run being resumed writes {journaled_format}; "
+                    f"pass --format {journaled_format}"
+                )
+            recovered = jobs.recover()
+            if recovered:
+                click.echo(f"Retrying {recovered} interrupted input(s)")
+        else:
+            jobs.reset()
+        jobs.set_meta("format", format)
+        paths = _output_paths(list(input_sources), output_dir, format, jobs.outputs())
+        for source, path in paths.items():
+            jobs.add(source, path)
+
+        remaining = jobs.remaining()
+        click.echo(f"{len(remaining)} input(s) to process")
+        for source in remaining:
+            entry = jobs.get(source)
+            jobs.start(source)
+            try:
+                if entry["document"]:
+                    # Converted by an earlier run; do not pay for the LLM again
+                    document = FTLDocument.model_validate_json(entry["document"])
+                else:
+                    document = _load_document(parser, source, None)
+                    jobs.record_document(source, document.model_dump_json())
+
+                if validate:
+                    results = validator.validate(document)
+                    if not results["valid"]:
+                        # Let --resume convert the input again instead of
+                        # re-validating the same rejected document
+                        jobs.discard_document(source)
+                        raise ValidationError("; ".join(results["errors"]))
+
+                generator.save_to_file(document, entry["output"], format)
+                if index is not None:
+                    index.add(document, entry["output"])
+            except Exception as e:
+                jobs.fail(source, f"{type(e).__name__}: {e}")
+                click.echo(f"Failed: {source}: {e}", err=True)
+                continue
+
+            jobs.finish(source)
+            click.echo(f"Generated FTL document: {entry['output']}")
+
+        counts = jobs.counts()
+        click.echo(
+            f"Done: {counts['done']}, failed: {counts['failed']}, "
+            f"pending: {counts['pending']}"
+        )
+        _report_hedging(parser)
+        if counts["failed"]:
+            click.echo("Re-run with --resume to retry failed inputs", err=True)
+            raise click.exceptions.Exit(1)
+
+
+DEFAULT_INDEX = "ftl-index.db"
+INDEXED_SUFFIXES = {".md", ".json", ".yaml", ".yml"}
+
+
+def _read_ftl_file(path: Path) -> FTLDocument:
+    """Load a generated FTL document from markdown, JSON or YAML, without the LLM."""
+    return load_document(
+        path.read_text(encoding="utf-8"), format_for_path(str(path)) or "markdown"
+    )
+
+
+def _collect_files(paths: Tuple[Path, ...], suffixes: set) -> List[Path]:
+    """Expand directories into the files below them with matching suffixes."""
+    files: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix in suffixes))
+        else:
+            files.append(path)
+    return files
+
+
+@main.command()
+@click.argument(
+    "paths", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path)
+)
+@click.option(
+    "--index",
+    "index_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_INDEX,
+    show_default=True,
+    help="Search index database",
+)
+def index(paths: Tuple[Path, ...], index_path: Path) -> None:
+    """Add generated FTL documents (files or directories) to the search index."""
+    files = _collect_files(paths, INDEXED_SUFFIXES)
+
+    with DocumentIndex(str(index_path)) as document_index:
+        changed = [f for f in files if not document_index.is_current(str(f))]
+        documents = []
+        for file in changed:
+            try:
+                documents.append((_read_ftl_file(file), str(file)))
+            except Exception as e:
+                click.echo(f"Skipping {file}: {e}", err=True)
+        count = document_index.add_many(documents)
+        click.echo(
+            f"Indexed {count} document(s), {len(files) - len(changed)} unchanged, "
+            f"{len(document_index)} total"
+        )
+
+
+@main.command()
+@click.argument("query", required=False)
+@click.option(
+    "--index",
+    "index_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_INDEX,
+    show_default=True,
+    help="Search index database",
+)
+@click.option("--tool", "tools", multiple=True, help="Require a tool (trailing * for prefix)")
+@click.option(
+    "--dependency",
+    "dependencies",
+    multiple=True,
+    help="Require a dependency (trailing * for prefix)",
+)
+@click.option(
+    "--produces", multiple=True, help="Require a product (trailing * for prefix)"
+)
+@click.option("--limit", "-n", default=50, show_default=True, help="Maximum results")
+@click.option(
+    "--fts",
+    is_flag=True,
+    help="Treat QUERY as an FTS5 expression (operators, field:term scoping)",
+)
+def search(
+    query: Optional[str],
+    index_path: Path,
+    tools: Tuple[str, ...],
+    dependencies: Tuple[str, ...],
+    produces: Tuple[str, ...],
+    limit: int,
+    fts: bool,
+) -> None:
+    """Search indexed FTL documents by text, tools, dependencies or products."""
+    with DocumentIndex(str(index_path)) as document_index:
+        try:
+            results = document_index.search(
+                query,
+                tools=tools,
+                dependencies=dependencies,
+                produces=produces,
+                limit=limit,
+                fts=fts,
+            )
+        except ValueError as e:
+            click.echo(f"Error: {e}", err=True)
+            raise click.Abort()
+
+    for result in results:
+        click.echo(f"{result['path']}\t{result['title']}")
+
+
+@main.command()
+@click.argument(
+    "paths", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path)
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="JSON Lines file to write (stdout when omitted)",
+)
+def export(paths: Tuple[Path, ...], output: Optional[Path]) -> None:
+    """Bundle generated FTL documents into one JSON Lines stream."""
+    files = _collect_files(paths, INDEXED_SUFFIXES | {".jsonl"})
+
+    def documents() -> Iterator[FTLDocument]:
+        for file in files:
+            if file.suffix == ".jsonl":
+                with file.open(encoding="utf-8") as f:
+                    yield from iter_jsonl(f)
+            else:
+                yield _read_ftl_file(file)
+
+    try:
+        if output:
+            count = DocumentGenerator().save_jsonl(documents(), str(output))
+            click.echo(f"Exported {count} document(s) to {output}", err=True)
+        else:
+            with click.open_file("-", "w") as stdout:
+                write_jsonl(documents(), stdout)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+
+@main.command("import")
+@click.argument("input_file", type=click.File("r", encoding="utf-8"))
+@click.option(
+    "--output-dir",
+    "-d",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Directory to write documents to",
+)
+@click.option(
+    "--format",
+    "-f",
+    type=click.Choice(["markdown", "json", "yaml"]),
+    default="markdown",
+    help="Output format",
+)
+@click.option(
+    "--index",
+    "index_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Add imported documents to this search index",
+)
+def import_documents(
+    input_file, output_dir: Path, format: str, index_path: Optional[Path]
+) -> None:
+    """Write each document of a JSON Lines stream (or - for stdin) to a file."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    generator = DocumentGenerator()
+    used = set()
+    written = []
+    try:
+        for document in iter_jsonl(input_file):
+            stem = _slugify(document.title)
+            name = stem
+            suffix = 2
+            while name in used:
+                name = f"{stem}-{suffix}"
+                suffix += 1
+            used.add(name)
+            path = str(output_dir / f"{name}{OUTPUT_SUFFIXES[format]}")
+            generator.save_to_file(document, path, format)
+            written.append((document, path))
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+    if index_path:
+        with DocumentIndex(str(index_path)) as document_index:
+            document_index.add_many(written)
+    click.echo(f"Imported {len(written)} document(s) into {output_dir}")
+
+
 @main.command()
 @click.argument("input_file", type=click.Path(exists=True, path_type=Path))
 def validate(input_file: Path):
@@ -133,7 +714,7 @@ def validate(input_file: Path):
         # Read and parse document
         content = input_file.read_text(encoding="utf-8")
         parser = DocumentParser()
-        document = parser.parse_markdown(content)
+        document = parser.parse_ftl(content)
 
         # Validate
         validator = DocumentValidator()
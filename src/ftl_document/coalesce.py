@@ -0,0 +1,108 @@
+"""Single-flight coalescing of identical concurrent LLM transformations."""
+
+import asyncio
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def normalize_content(content: str) -> str:
+    """Normalize document content so trivially different inputs share a key."""
+    lines = content.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def make_key(content: str, fingerprint: str) -> str:
+    """Build a coalescing key from normalized content and a prompt/model fingerprint."""
+    digest = hashlib.sha256()
+    digest.update(fingerprint.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_content(content).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class _Call:
+    """An in-progress synchronous call shared by all callers with the same key."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Any = None
+
+
+class SingleFlight:
+    """Ensures only one call per key is in flight; concurrent callers share it.
+
+    The synchronous path coalesces callers across threads, the asynchronous
+    path coalesces coroutines running on the same event loop.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[int, Hashable], "asyncio.Task[Any]"] = {}
+        self.stats = {"calls": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run fn for key, or wait for the identical call already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.stats["calls"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn for key, or await the identical call already in flight."""
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = loop.create_task(fn())
+                self._tasks[task_key] = task
+                self.stats["calls"] += 1
+                task.add_done_callback(lambda _: self._forget(task_key))
+            else:
+                self.stats["coalesced"] += 1
+
+        # Shield so that one cancelled caller does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _forget(self, task_key: Tuple[int, Hashable]) -> None:
+        """Drop a finished async call so later requests start a fresh one."""
+        with self._lock:
+            self._tasks.pop(task_key, None)
+
+    @property
+    def calls_saved(self) -> int:
+        """Number of calls avoided by joining an in-flight call."""
+        return self.stats["coalesced"]
+
+
+# Shared by all parsers so identical requests coalesce across instances
+DEFAULT_SINGLE_FLIGHT = SingleFlight()
@@ -0,0 +1,158 @@
+"""Compact, read-only in-memory representation of FTL documents.
+
+``CompactDocument`` holds the same fields as ``FTLDocument`` in a slotted
+record backed by tuples, without pydantic's per-instance validation state.
+Tool, dependency and product names are interned so a corpus that repeats
+``apt_tool`` a hundred thousand times stores the string once. It converts
+losslessly to and from ``FTLDocument`` and exposes the attributes and
+``model_dump``/``model_dump_json`` methods that ``DocumentValidator``,
+``DocumentGenerator`` and ``DocumentIndex`` use, so they accept it directly.
+"""
+
+import json
+import sys
+from typing import IO, Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .core import FTLDocument
+from .serialization import dumps_json, loads_json
+
+LIST_FIELDS = (
+    "dependencies",
+    "tools_required",
+    "questions",
+    "implementation_steps",
+    "verification_steps",
+    "produces",
+)
+
+# Short names repeated across a corpus; worth sharing a single copy
+INTERNED_FIELDS = ("dependencies", "tools_required", "produces")
+
+
+def _as_strings(field: str, values: Iterable[str]) -> Tuple[str, ...]:
+    """Check that a list field holds strings and freeze it as a tuple."""
+    if isinstance(values, str):
+        raise TypeError(f"{field} must be a list of strings, not a string")
+    items = tuple(values)
+    for item in items:
+        if not isinstance(item, str):
+            raise TypeError(f"{field} must contain strings, got {type(item).__name__}")
+    if field in INTERNED_FIELDS:
+        return tuple(sys.intern(item) for item in items)
+    return items
+
+
+class CompactDocument:
+    """A read-only FTL document stored as interned strings in tuples."""
+
+    __slots__ = ("title",) + LIST_FIELDS + ("_metadata",)
+
+    def __init__(
+        self,
+        title: str,
+        dependencies: Iterable[str] = (),
+        tools_required: Iterable[str] = (),
+        questions: Iterable[str] = (),
+        implementation_steps: Iterable[str] = (),
+        verification_steps: Iterable[str] = (),
+        produces: Iterable[str] = (),
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        if not isinstance(title, str):
+            raise TypeError(f"title must be a string, got {type(title).__name__}")
+        setter = object.__setattr__
+        setter(self, "title", title)
+        setter(self, "dependencies", _as_strings("dependencies", dependencies))
+        setter(self, "tools_required", _as_strings("tools_required", tools_required))
+        setter(self, "questions", _as_strings("questions", questions))
+        setter(
+            self,
+            "implementation_steps",
+            _as_strings("implementation_steps", implementation_steps),
+        )
+        setter(
+            self,
+            "verification_steps",
+            _as_strings("verification_steps", verification_steps),
+        )
+        setter(self, "produces", _as_strings("produces", produces))
+        # Most documents have no metadata; share None rather than empty dicts
+        setter(self, "_metadata", dict(metadata) if metadata else None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CompactDocument is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("CompactDocument is read-only")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactDocument):
+            return NotImplemented
+        return self.model_dump() == other.model_dump()
+
+    def __repr__(self) -> str:
+        return f"CompactDocument(title={self.title!r})"
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Additional metadata (a copy; the record itself is read-only)."""
+        return dict(self._metadata) if self._metadata else {}
+
+    @classmethod
+    def from_document(cls, document: FTLDocument) -> "CompactDocument":
+        """Build a compact record from an FTLDocument."""
+        return cls(
+            document.title,
+            *(getattr(document, field) for field in LIST_FIELDS),
+            metadata=document.metadata,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactDocument":
+        """Build a compact record from a plain dict such as parsed JSON."""
+        if "title" not in data:
+            raise ValueError("Document is missing a title")
+        return cls(
+            data["title"],
+            *(data.get(field) or () for field in LIST_FIELDS),
+            metadata=data.get("metadata"),
+        )
+
+    def to_document(self) -> FTLDocument:
+        """Convert back to a full pydantic FTLDocument."""
+        return FTLDocument.model_validate(self.model_dump())
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Return the document as a plain dict, like FTLDocument.model_dump."""
+        data: Dict[str, Any] = {"title": self.title}
+        for field in LIST_FIELDS:
+            data[field] = list(getattr(self, field))
+        data["metadata"] = self.metadata
+        return data
+
+    def model_dump_json(self, indent: Optional[int] = None) -> str:
+        """Return the document as JSON, like FTLDocument.model_dump_json."""
+        if indent is None:
+            return dumps_json(self.model_dump())
+        return json.dumps(self.model_dump(), indent=indent, ensure_ascii=False)
+
+
+DocumentLike = Union[FTLDocument, CompactDocument]
+
+
+def compact(document: DocumentLike) -> CompactDocument:
+    """Return the compact form of a document."""
+    if isinstance(document, CompactDocument):
+        return document
+    return CompactDocument.from_document(document)
+
+
+def iter_compact_jsonl(stream: IO[str]) -> Iterator[CompactDocument]:
+    """Lazily read CompactDocuments from a JSON Lines text stream."""
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield CompactDocument.from_dict(loads_json(line))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid document on line {number}: {e}")
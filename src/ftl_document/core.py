@@ -1,8 +1,26 @@
 """Core FTL Document classes and data structures."""
 
-from typing import List, Optional, Dict, Any
+import io
+import itertools
+import tempfile
+from typing import Iterable, List, Optional, Dict, Any, Union
 from pydantic import BaseModel, Field
 from .llm_service import LLMService
+from .coalesce import SingleFlight, DEFAULT_SINGLE_FLIGHT, make_key
+from .tracing import get_tracer, traced
+from .docx_reader import DocxSource, docx_to_markdown
+from .streams import SPOOL_SIZE, iter_lines, iter_text, split_head
+from .formats import (
+    SECTION_HEADING,
+    html_chunks_to_markdown,
+    html_to_markdown,
+    is_ftl,
+    normalize_format,
+    normalize_lines,
+    normalize_text,
+    section_for_heading,
+    sniff_format,
+)
 
 
 class FTLDocument(BaseModel):
@@ -42,15 +60,41 @@ class FTLDocument(BaseModel):
 class DocumentParser:
     """Parser for converting various document formats to FTL Documents using LLM."""
 
-    def __init__(self, model: str = "claude-sonnet-4-20250514"):
+    def __init__(
+        self,
+        model: str = "claude-sonnet-4-20250514",
+        single_flight: Optional[SingleFlight] = None,
+        hedge_model: Optional[str] = None,
+        hedge_percentile: float = 95.0,
+        hedge_delay: float = 30.0,
+    ):
         self.supported_formats = ["markdown", "docx", "txt", "html"]
-        self.llm_service = LLMService(model=model)
+        self.llm_service = LLMService(
+            model=model,
+            hedge_model=hedge_model,
+            hedge_percentile=hedge_percentile,
+            hedge_delay=hedge_delay,
+        )
+        self.single_flight = single_flight or DEFAULT_SINGLE_FLIGHT
+        self.llm_calls_skipped = 0
+
+    def _coalesce_key(self, content: str) -> str:
+        """Key identical inputs sent with the same prompts and model."""
+        return make_key(content, self.llm_service.fingerprint())
 
     def parse_with_llm(self, content: str) -> FTLDocument:
-        """Parse any content using LLM transformation to FTL Document."""
+        """Parse any content using LLM transformation to FTL Document.
+
+        Concurrent calls with identical content, prompts and model share a
+        single in-flight LLM call.
+        """
         try:
             # Transform content using LLM
-            transformed_content = self.llm_service.transform_document(content)
+            with get_tracer().span("parser.llm", model=self.llm_service.model):
+                transformed_content = self.single_flight.do(
+                    self._coalesce_key(content),
+                    lambda: self.llm_service.transform_document(content),
+                )
 
             # Parse the LLM response into structured data
             return self._parse_ftl_markdown(transformed_content)
@@ -58,6 +102,21 @@ class DocumentParser:
         except Exception as e:
             raise RuntimeError(f"Failed to parse content with LLM: {str(e)}")
 
+    async def aparse_with_llm(self, content: str) -> FTLDocument:
+        """Asynchronously parse content using LLM transformation to FTL Document."""
+        try:
+            with get_tracer().span("parser.llm", model=self.llm_service.model):
+                transformed_content = await self.single_flight.do_async(
+                    self._coalesce_key(content),
+                    lambda: self.llm_service.atransform_document(content),
+                )
+
+            return self._parse_ftl_markdown(transformed_content)
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to parse content with LLM: {str(e)}")
+
+    @traced("parser.parse")
     def _parse_ftl_markdown(self, markdown_content: str) -> FTLDocument:
         """Parse FTL-formatted markdown into FTLDocument object."""
         lines = markdown_content.strip().split("\n")
@@ -72,37 +131,31 @@ class DocumentParser:
         produces = []
 
         current_section = None
+        in_fence = False
 
         for line in lines:
             line = line.strip()
 
-            # Check for title (markdown h1)
-            if line.startswith("# "):
-                title = line[2:].strip()
-                continue
-
-            # Check for sections
-            if line.startswith("**") and line.endswith("**"):
-                section_name = line[2:-2].lower()
-                if "requirement" in section_name or "dependencies" in section_name:
-                    current_section = "dependencies"
-                    continue
-                elif "tool" in section_name:
-                    current_section = "tools_required"
-                    continue
-                elif "question" in section_name:
-                    current_section = "questions"
-                    continue
-                elif "implementation" in section_name:
-                    current_section = "implementation_steps"
-                    continue
-                elif "verification" in section_name:
-                    current_section = "verification_steps"
-                    continue
-                elif "produce" in section_name:
-                    current_section = "produces"
+            # Headings inside fenced code blocks are content, not structure
+            if line.startswith("```"):
+                in_fence = not in_fence
+            elif not in_fence:
+                # Check for title (markdown h1)
+                if line.startswith("# ") and not title:
+                    title = line[2:].strip()
                     continue
 
+                # Check for sections (markdown headings or bold lines)
+                match = SECTION_HEADING.match(line)
+                if match:
+                    section = section_for_heading(match.group(1) or match.group(2))
+                    if section:
+                        current_section = section
+                        continue
+
+            if not line:
+                continue
+
             def strip_list_item_prefix(item):
                 if item.startswith("- "):
                     item = item[2:]
@@ -137,25 +190,101 @@ class DocumentParser:
             produces=produces,
         )
 
+    def parse_ftl(self, content: str) -> FTLDocument:
+        """Parse a document already in FTL format locally, without the LLM."""
+        return self._parse_ftl_markdown(content)
+
     def parse_markdown(self, content: str) -> FTLDocument:
         """Parse markdown content into an FTL Document using LLM."""
-        return self.parse_with_llm(content)
+        return self.parse_with_llm(normalize_text(content))
 
-    def parse_docx(self, file_path: str) -> FTLDocument:
+    def parse_docx(self, file_path: DocxSource) -> FTLDocument:
         """Parse DOCX file into an FTL Document using LLM."""
-        # For now, raise NotImplementedError - could be enhanced later
-        raise NotImplementedError("DOCX parsing not yet implemented")
+        with get_tracer().span("parser.preprocess", format="docx"):
+            content = docx_to_markdown(file_path)
+        return self.parse_with_llm(content)
 
     def parse_text(self, content: str) -> FTLDocument:
         """Parse plain text content into an FTL Document using LLM."""
-        return self.parse_with_llm(content)
+        return self.parse_with_llm(normalize_text(content))
 
     def parse_html(self, content: str) -> FTLDocument:
         """Parse HTML content into an FTL Document using LLM."""
+        with get_tracer().span("parser.preprocess", format="html"):
+            content = html_to_markdown(content)
         return self.parse_with_llm(content)
 
     def auto_parse(
-        self, content: str, format_hint: Optional[str] = None
+        self, content: Union[str, bytes], format_hint: Optional[str] = None
     ) -> FTLDocument:
-        """Automatically detect format and parse content using LLM."""
+        """Detect the format of content and route it to the matching parser.
+
+        Content that is already a valid FTL document is parsed locally and
+        never sent to the LLM. DOCX may be given as raw bytes or, with a
+        ``docx`` hint, as a file path.
+        """
+        format = normalize_format(format_hint) or sniff_format(content)
+
+        if format == "docx":
+            source = io.BytesIO(content) if isinstance(content, bytes) else content
+            return self.parse_docx(source)
+
+        if isinstance(content, bytes):
+            content = content.decode("utf-8", errors="replace")
+
+        if format == "ftl":
+            # Imported here as the validator depends on this module
+            from .validator import DocumentValidator
+
+            document = self.parse_ftl(content)
+            if DocumentValidator().validate(document)["valid"]:
+                self.llm_calls_skipped += 1
+                return document
+            return self.parse_markdown(content)
+        if format == "html":
+            return self.parse_html(content)
+        if format == "markdown":
+            return self.parse_markdown(content)
+        return self.parse_text(content)
+
+    def parse_chunks(
+        self,
+        chunks: Iterable[bytes],
+        format_hint: Optional[str] = None,
+        encoding: str = "utf-8",
+    ) -> FTLDocument:
+        """Parse input arriving as byte chunks, e.g. from stdin or a pipe.
+
+        The format is detected from the first chunks; input detected as
+        markdown is checked for FTL layout once fully read. HTML and text are
+        preprocessed as they are decoded, so the raw input is never held in
+        memory whole; DOCX needs random access and is spooled to a temporary
+        file once it outgrows memory.
+        """
+        head, rest = split_head(chunks)
+        format = normalize_format(format_hint) or sniff_format(head)
+
+        if format == "docx":
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+                spool.write(head)
+                for chunk in rest:
+                    spool.write(chunk)
+                spool.seek(0)
+                return self.parse_docx(spool)
+
+        text = iter_text(itertools.chain((head,), rest), encoding)
+        with get_tracer().span("parser.preprocess", format=format):
+            if format == "html":
+                content = html_chunks_to_markdown(text)
+            else:
+                content = normalize_lines(iter_lines(text))
+        if not content:
+            raise ValueError("Input is empty; nothing to convert")
+
+        # The head alone may cut an FTL document off before its Implementation
+        # Steps, so sniffed markdown gets the FTL check on the full text
+        if format == "ftl" or (
+            format == "markdown" and not format_hint and is_ftl(content)
+        ):
+            return self.auto_parse(content, "ftl")
         return self.parse_with_llm(content)
@@ -0,0 +1,197 @@
+"""Streaming DOCX to compact markdown conversion.
+
+``word/document.xml`` is decompressed straight out of the zip archive and
+parsed incrementally, discarding each block once it has been converted, so
+memory use stays flat regardless of document size. Headings, lists and
+tables are kept; images, drawings and styling are dropped because they only
+cost tokens in the LLM stage.
+"""
+
+import re
+import zipfile
+from typing import IO, Dict, Iterator, List, Optional, Union
+from xml.etree.ElementTree import Element, iterparse
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+DOCUMENT_PART = "word/document.xml"
+NUMBERING_PART = "word/numbering.xml"
+
+# Elements whose content is never useful to the LLM
+SKIPPED = {W + "drawing", W + "pict", W + "object", W + "sectPr", W + "rPr"}
+
+HEADING_STYLE = re.compile(r"^heading\s*(\d)$", re.IGNORECASE)
+
+DocxSource = Union[str, IO[bytes]]
+
+
+def _load_numbering(archive: zipfile.ZipFile) -> Dict[str, Dict[str, str]]:
+    """Map numbering ids to the number format of each list level."""
+    if NUMBERING_PART not in archive.namelist():
+        return {}
+
+    abstract_formats: Dict[str, Dict[str, str]] = {}
+    abstract_for_num: Dict[str, str] = {}
+    abstract_id: Optional[str] = None
+    level: Optional[str] = None
+    num_id: Optional[str] = None
+
+    with archive.open(NUMBERING_PART) as stream:
+        for event, elem in iterparse(stream, events=("start", "end")):
+            if event == "start":
+                if elem.tag == W + "abstractNum":
+                    abstract_id = elem.get(W + "abstractNumId")
+                    abstract_formats[abstract_id] = {}
+                elif elem.tag == W + "lvl":
+                    level = elem.get(W + "ilvl")
+                elif elem.tag == W + "num":
+                    num_id = elem.get(W + "numId")
+                continue
+
+            if elem.tag == W + "numFmt" and abstract_id is not None and level:
+                abstract_formats[abstract_id][level] = elem.get(W + "val", "")
+            elif elem.tag == W + "abstractNumId" and num_id is not None:
+                abstract_for_num[num_id] = elem.get(W + "val", "")
+            elif elem.tag == W + "abstractNum":
+                abstract_id = None
+            elif elem.tag == W + "num":
+                num_id = None
+            elem.clear()
+
+    return {
+        num: abstract_formats.get(abstract, {})
+        for num, abstract in abstract_for_num.items()
+    }
+
+
+class _Paragraph:
+    """Text and formatting collected for the paragraph being parsed."""
+
+    __slots__ = ("parts", "style", "num_id", "level")
+
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+        self.style = ""
+        self.num_id: Optional[str] = None
+        self.level = "0"
+
+    def text(self) -> str:
+        return re.sub(r"[ \t]+", " ", "".join(self.parts)).strip()
+
+
+def _format_paragraph(
+    paragraph: _Paragraph, numbering: Dict[str, Dict[str, str]]
+) -> str:
+    """Render a paragraph as a markdown heading, list item or plain line."""
+    text = paragraph.text()
+    if not text:
+        return ""
+
+    style = paragraph.style.lower()
+    if style == "title":
+        return f"\n# {text}"
+    heading = HEADING_STYLE.match(style)
+    if heading:
+        return f"\n{'#' * min(int(heading.group(1)), 6)} {text}"
+
+    if paragraph.num_id not in (None, "0"):
+        fmt = numbering.get(paragraph.num_id, {}).get(paragraph.level, "bullet")
+        marker = "- " if fmt in ("bullet", "none", "") else "1. "
+        return f"{'  ' * int(paragraph.level or 0)}{marker}{text}"
+    if style.startswith("listbullet"):
+        return f"- {text}"
+    if style.startswith("listnumber"):
+        return f"1. {text}"
+
+    return text
+
+
+def iter_docx_markdown(source: DocxSource) -> Iterator[str]:
+    """Yield compact markdown lines for a DOCX file path or binary stream."""
+    with zipfile.ZipFile(source) as archive:
+        numbering = _load_numbering(archive)
+
+        with archive.open(DOCUMENT_PART) as stream:
+            body: Optional[Element] = None
+            depth = 0
+            skip_depth = 0
+            run_depth = 0
+            table_depth = 0
+            paragraph = _Paragraph()
+            cell: List[str] = []
+            row: List[str] = []
+            rows_emitted = 0
+
+            for event, elem in iterparse(stream, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    depth += 1
+                    if skip_depth or tag in SKIPPED:
+                        skip_depth += 1
+                    elif tag == W + "body":
+                        body = elem
+                    elif tag == W + "r":
+                        run_depth += 1
+                    elif tag == W + "tbl":
+                        table_depth += 1
+                        if table_depth == 1:
+                            rows_emitted = 0
+                            yield ""
+                    elif tag == W + "tr" and table_depth == 1:
+                        row = []
+                    elif tag == W + "tc" and table_depth == 1:
+                        cell = []
+                    continue
+
+                depth -= 1
+                if skip_depth:
+                    skip_depth -= 1
+                    elem.clear()
+                    continue
+
+                if tag == W + "t":
+                    paragraph.parts.append(elem.text or "")
+                elif tag == W + "tab" and run_depth:
+                    paragraph.parts.append("\t")
+                elif tag in (W + "br", W + "cr") and run_depth:
+                    paragraph.parts.append(" ")
+                elif tag == W + "r":
+                    run_depth -= 1
+                elif tag == W + "pStyle":
+                    paragraph.style = elem.get(W + "val", "")
+                elif tag == W + "numId":
+                    paragraph.num_id = elem.get(W + "val")
+                elif tag == W + "ilvl":
+                    paragraph.level = elem.get(W + "val", "0")
+                elif tag == W + "p":
+                    if table_depth:
+                        text = paragraph.text()
+                        if text:
+                            cell.append(text)
+                    else:
+                        line = _format_paragraph(paragraph, numbering)
+                        if line:
+                            yield line
+                    paragraph = _Paragraph()
+                elif tag == W + "tc" and table_depth == 1:
+                    row.append(" ".join(cell).replace("|", "\\|"))
+                elif tag == W + "tr" and table_depth == 1:
+                    yield f"| {' | '.join(row)} |"
+                    if rows_emitted == 0:
+                        yield f"|{' --- |' * len(row)}"
+                    rows_emitted += 1
+                elif tag == W + "tbl":
+                    table_depth -= 1
+                    if table_depth == 0:
+                        yield ""
+
+                # Drop converted content so the tree never grows
+                if tag in (W + "p", W + "tr", W + "tbl"):
+                    elem.clear()
+                if depth == 2 and body is not None:
+                    body.clear()
+
+
+def docx_to_markdown(source: DocxSource) -> str:
+    """Convert a DOCX file path or binary stream to compact markdown."""
+    return "\n".join(iter_docx_markdown(source)).strip()
@@ -0,0 +1,212 @@
+"""Input format detection and per-format preprocessing."""
+
+import re
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional, Union
+
+DOCX_MAGIC = b"PK\x03\x04"
+
+# Aliases accepted as a format hint, mapped to the canonical format name
+FORMAT_ALIASES = {
+    "ftl": "ftl",
+    "markdown": "markdown",
+    "md": "markdown",
+    "html": "html",
+    "htm": "html",
+    "text": "text",
+    "txt": "text",
+    "docx": "docx",
+}
+
+# Section titles (lowercase) accepted for each FTLDocument field
+SECTION_TITLES = {
+    "requirements": "dependencies",
+    "dependencies": "dependencies",
+    "prerequisites": "dependencies",
+    "tools needed": "tools_required",
+    "tools required": "tools_required",
+    "required tools": "tools_required",
+    "tools": "tools_required",
+    "user questions": "questions",
+    "questions": "questions",
+    "implementation steps": "implementation_steps",
+    "implementation": "implementation_steps",
+    "verification steps": "verification_steps",
+    "verification": "verification_steps",
+    "produces": "produces",
+}
+
+HTML_DOCUMENT = re.compile(r"^\s*(<\?xml[^>]*>\s*)?(<!doctype\s+html|<html\b)", re.I)
+HTML_TAG = re.compile(
+    r"<(head|body|div|p|h[1-6]|ul|ol|li|table|span|a|br|pre|section|article)\b[^>]*>",
+    re.I,
+)
+MARKDOWN_SIGNALS = [
+    re.compile(r"^#{1,6}\s+\S", re.M),
+    re.compile(r"^\s*[-*+]\s+\S", re.M),
+    re.compile(r"^\s*\d+\.\s+\S", re.M),
+    re.compile(r"^```", re.M),
+    re.compile(r"\[[^\]]+\]\([^)]+\)"),
+    re.compile(r"\*\*[^*\n]+\*\*"),
+]
+# A fenced code block, or an unterminated one running to the end of the text
+FENCED_BLOCK = re.compile(r"^```.*?(?:^```[^\n]*$|\Z)", re.M | re.S)
+
+# Sections are level-2 headings or full-line bold text; deeper headings are
+# content within a section
+SECTION_HEADING = re.compile(r"^(?:##\s+(.+?)|\*\*(.+?)\*\*):?\s*$")
+
+
+def section_for_heading(name: str) -> Optional[str]:
+    """Return the FTLDocument field named by a section heading, if any."""
+    return SECTION_TITLES.get(" ".join(name.lower().rstrip(":").split()))
+
+
+def normalize_format(format_hint: Optional[str]) -> Optional[str]:
+    """Map a user supplied format hint to a canonical format name."""
+    if format_hint is None:
+        return None
+    try:
+        return FORMAT_ALIASES[format_hint.lower().lstrip(".")]
+    except KeyError:
+        raise ValueError(f"Unsupported format: {format_hint}")
+
+
+def is_ftl(content: str) -> bool:
+    """Check whether markdown content is already laid out as an FTL document."""
+    lines = [line.strip() for line in content.splitlines()]
+    if not any(line.startswith("# ") for line in lines):
+        return False
+
+    sections = set()
+    for line in lines:
+        match = SECTION_HEADING.match(line)
+        if match:
+            section = section_for_heading(match.group(1) or match.group(2))
+            if section:
+                sections.add(section)
+    return "implementation_steps" in sections and len(sections) >= 3
+
+
+def sniff_format(content: Union[str, bytes]) -> str:
+    """Detect whether content is docx, html, ftl, markdown or plain text."""
+    if isinstance(content, bytes):
+        if content.startswith(DOCX_MAGIC):
+            return "docx"
+        content = content.decode("utf-8", errors="replace")
+
+    head = content[:4096]
+    if HTML_DOCUMENT.match(head):
+        return "html"
+    if is_ftl(content):
+        return "ftl"
+    # Markdown often quotes HTML in code blocks or inline, so only fall back
+    # to counting tags (outside fenced blocks) when it does not look like markdown
+    if sum(1 for signal in MARKDOWN_SIGNALS if signal.search(content)) >= 2:
+        return "markdown"
+    if len(HTML_TAG.findall(FENCED_BLOCK.sub("", head))) >= 3:
+        return "html"
+    return "text"
+
+
+def normalize_text(content: str) -> str:
+    """Trim trailing whitespace and collapse runs of blank lines."""
+    return normalize_lines(content.split("\n"))
+
+
+def normalize_lines(lines: Iterable[str]) -> str:
+    """Normalize text supplied line by line, as normalize_text does.
+
+    Lines are consumed one at a time, so a large input can be streamed in
+    without first being joined into one string.
+    """
+    kept: List[str] = []
+    blank = False
+    for line in lines:
+        line = line.rstrip()
+        if not line:
+            blank = True
+            continue
+        if not kept:
+            line = line.lstrip()
+        elif blank:
+            kept.append("")
+        blank = False
+        kept.append(line)
+    return "\n".join(kept)
+
+
+class _MarkdownHTMLParser(HTMLParser):
+    """Reduces HTML to compact markdown, dropping scripts, styles and markup."""
+
+    SKIPPED = {"script", "style", "noscript", "svg", "head", "iframe", "template"}
+    BLOCKS = {"p", "div", "section", "article", "br", "tr", "ul", "ol", "table", "hr"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.skip_depth = 0
+        self.pre_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED:
+            self.skip_depth += 1
+        elif self.skip_depth:
+            return
+        elif tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self.parts.append(f"\n\n{'#' * int(tag[1])} ")
+        elif tag == "li":
+            self.parts.append("\n- ")
+        elif tag in ("td", "th"):
+            self.parts.append(" | ")
+        elif tag == "pre":
+            self.pre_depth += 1
+            self.parts.append("\n```\n")
+        elif tag in self.BLOCKS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif self.skip_depth:
+            return
+        elif tag == "pre":
+            self.pre_depth = max(0, self.pre_depth - 1)
+            self.parts.append("\n```\n")
+        elif tag in ("h1", "h2", "h3", "h4", "h5", "h6") or tag in self.BLOCKS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if self.pre_depth:
+            self.parts.append(data)
+        else:
+            self.parts.append(re.sub(r"\s+", " ", data))
+
+    def markdown(self) -> str:
+        lines = []
+        in_pre = False
+        for line in "".join(self.parts).split("\n"):
+            if line == "```":
+                in_pre = not in_pre
+            lines.append(line.rstrip() if in_pre else line.strip())
+        return normalize_text("\n".join(lines))
+
+
+def html_to_markdown(content: str) -> str:
+    """Convert HTML to compact markdown text for the LLM."""
+    return html_chunks_to_markdown([content])
+
+
+def html_chunks_to_markdown(chunks: Iterable[str]) -> str:
+    """Convert HTML arriving in text chunks to compact markdown text.
+
+    Each chunk is parsed as it arrives and dropped, so only the (much
+    smaller) markdown is kept in memory.
+    """
+    parser = _MarkdownHTMLParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser.markdown()
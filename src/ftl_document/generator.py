@@ -1,7 +1,26 @@
 """FTL Document generator for creating formatted output."""
 
-from typing import Optional, Dict
-from .core import FTLDocument
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from string import Formatter
+from typing import IO, Iterable, Iterator, Optional, Dict
+from .compact import DocumentLike
+from .serialization import dump_yaml, write_jsonl
+from .tracing import get_tracer, traced
+
+
+def _read_umask() -> int:
+    """Return the process umask (which can only be read by setting it)."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import; toggling the process-wide umask on every write would
+# briefly give files created by other threads a zero umask
+UMASK = _read_umask()
 
 
 class DocumentGenerator:
@@ -38,27 +57,45 @@ class DocumentGenerator:
 """
         return {"default": default_template}
 
-    def generate_markdown(self, document: FTLDocument) -> str:
+    @traced("generator.render")
+    def generate_markdown(self, document: DocumentLike) -> str:
         """Generate markdown formatted FTL document."""
-        template = self.templates["default"]
+        return "".join(self.iter_markdown(document))
+
+    def iter_markdown(self, document: DocumentLike) -> Iterator[str]:
+        """Yield the markdown document piece by piece, section by section.
 
-        # Format sections
-        dependencies = self._format_list_section(document.dependencies)
-        tools_required = self._format_list_section(document.tools_required, prefix="- ")
-        questions = self._format_list_section(document.questions, prefix="- ")
-        implementation_steps = "\n".join(document.implementation_steps)
-        verification_steps = "\n".join(document.verification_steps)
-        produces = self._format_list_section(document.produces, prefix="- ")
-
-        return template.format(
-            title=document.title,
-            dependencies=dependencies,
-            tools_required=tools_required,
-            questions=questions,
-            implementation_steps=implementation_steps,
-            verification_steps=verification_steps,
-            produces=produces,
-        ).strip()
+        Sections are rendered only as they are reached, and the joined pieces
+        equal ``generate_markdown``'s output (stripped of outer whitespace).
+        """
+        template = self.templates["default"]
+        started = False
+        # Whitespace held back until more text follows, so the output ends
+        # exactly as str.strip() would end it
+        pending = ""
+        for literal, field, _, _ in Formatter().parse(template):
+            pieces = [literal]
+            if field is not None:
+                pieces.append(self._render_field(document, field))
+            for piece in pieces:
+                text = pending + piece
+                if not started:
+                    text = text.lstrip()
+                    if not text:
+                        continue
+                    started = True
+                body = text.rstrip()
+                pending = text[len(body) :]
+                if body:
+                    yield body
+
+    def _render_field(self, document: DocumentLike, field: str) -> str:
+        """Format one template field of a document."""
+        if field == "title":
+            return document.title
+        if field in ("implementation_steps", "verification_steps"):
+            return "\n".join(getattr(document, field))
+        return self._format_list_section(getattr(document, field), prefix="- ")
 
     def _format_list_section(self, items: list, prefix: str = "- ") -> str:
         """Format a list of items with given prefix."""
@@ -66,28 +103,86 @@ class DocumentGenerator:
             return ""
         return "\n".join(f"{prefix}{item}" for item in items if item)
 
-    def generate_json(self, document: FTLDocument) -> str:
+    @traced("generator.render")
+    def generate_json(self, document: DocumentLike) -> str:
         """Generate JSON representation of FTL document."""
         return document.model_dump_json(indent=2)
 
-    def generate_yaml(self, document: FTLDocument) -> str:
+    @traced("generator.render")
+    def generate_yaml(self, document: DocumentLike) -> str:
         """Generate YAML representation of FTL document."""
-        import yaml
-
-        return yaml.dump(document.model_dump(), default_flow_style=False)
+        return dump_yaml(document.model_dump())
 
     def save_to_file(
-        self, document: FTLDocument, output_path: str, format: str = "markdown"
+        self, document: DocumentLike, output_path: str, format: str = "markdown"
     ) -> None:
         """Save generated document to file."""
+        if format not in ("markdown", "json", "yaml"):
+            raise ValueError(f"Unsupported format: {format}")
+
+        with get_tracer().span("generator.write", path=output_path):
+            with atomic_open(output_path) as f:
+                self.write(document, f, format)
+
+    def write(
+        self, document: DocumentLike, stream: IO[str], format: str = "markdown"
+    ) -> None:
+        """Write a generated document to a text stream.
+
+        Markdown is written section by section as it is rendered, so output
+        to a pipe starts before the whole document has been formatted.
+        """
         if format == "markdown":
-            content = self.generate_markdown(document)
+            with get_tracer().span("generator.render"):
+                for piece in self.iter_markdown(document):
+                    stream.write(piece)
         elif format == "json":
-            content = self.generate_json(document)
+            stream.write(self.generate_json(document))
         elif format == "yaml":
-            content = self.generate_yaml(document)
+            stream.write(self.generate_yaml(document))
         else:
             raise ValueError(f"Unsupported format: {format}")
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
+    def save_jsonl(self, documents: Iterable[DocumentLike], output_path: str) -> int:
+        """Stream many documents into one JSON Lines file; return the count."""
+        with get_tracer().span("generator.write", path=output_path):
+            with atomic_open(output_path) as f:
+                return write_jsonl(documents, f)
+
+
+def atomic_write(path: str, content: str) -> None:
+    """Write content to path via a temp file and rename."""
+    with atomic_open(path) as f:
+        f.write(content)
+
+
+@contextmanager
+def atomic_open(path: str) -> Iterator[IO[str]]:
+    """Open a temp file that replaces path only once fully written.
+
+    Readers see either the previous file or the complete new one, never a
+    partially written file, even if the process is killed mid-write.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates files as 0600; keep the mode of the file being
+        # replaced, or match what open() would have created
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
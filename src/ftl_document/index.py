@@ -0,0 +1,254 @@
+"""Searchable SQLite index of generated FTL documents.
+
+Every document's fields are stored in an FTS5 table for full-text queries,
+and ``tools_required``, ``dependencies`` and ``produces`` entries are kept in
+an inverted term table for exact or prefix lookups, so queries stay fast on
+corpora of 100k+ documents without re-parsing any files.
+"""
+
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .core import FTLDocument
+from .compact import DocumentLike
+
+# Fields with an inverted index, keyed by their search parameter name
+TERM_FIELDS = {
+    "tools": "tools_required",
+    "dependencies": "dependencies",
+    "produces": "produces",
+}
+
+TEXT_FIELDS = [
+    "title",
+    "dependencies",
+    "tools_required",
+    "questions",
+    "implementation_steps",
+    "verification_steps",
+    "produces",
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    document TEXT NOT NULL,
+    mtime REAL
+);
+CREATE TABLE IF NOT EXISTS terms (
+    field TEXT NOT NULL,
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (field, term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS terms_doc ON terms (doc_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5({", ".join(TEXT_FIELDS)});
+"""
+
+
+def quote_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching all of its words literally.
+
+    Each whitespace separated word becomes a quoted phrase, so characters
+    such as ``.``, ``-``, ``+`` or ``:`` are searched for rather than parsed
+    as query syntax.
+    """
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def normalize_term(term: str) -> str:
+    """Normalize a tool, dependency or product name for exact matching."""
+    return " ".join(term.lower().split())
+
+
+class DocumentIndex:
+    """SQLite/FTS5 index over FTLDocuments, keyed by their absolute output path."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "DocumentIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    def _delete(self, path: str) -> None:
+        """Remove a document and its index entries (within a transaction)."""
+        row = self.conn.execute(
+            "SELECT id FROM documents WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return
+        self.conn.execute("DELETE FROM terms WHERE doc_id = ?", row)
+        self.conn.execute("DELETE FROM documents_fts WHERE rowid = ?", row)
+        self.conn.execute("DELETE FROM documents WHERE id = ?", row)
+
+    def _insert(self, document: DocumentLike, path: str, mtime: Optional[float]) -> None:
+        """Insert a document and its index entries (within a transaction)."""
+        self._delete(path)
+        cursor = self.conn.execute(
+            "INSERT INTO documents (path, title, document, mtime) VALUES (?, ?, ?, ?)",
+            (path, document.title, document.model_dump_json(), mtime),
+        )
+        doc_id = cursor.lastrowid
+        self.conn.execute(
+            f"INSERT INTO documents_fts (rowid, {', '.join(TEXT_FIELDS)}) "
+            f"VALUES (?{', ?' * len(TEXT_FIELDS)})",
+            (
+                doc_id,
+                document.title,
+                *("\n".join(getattr(document, field)) for field in TEXT_FIELDS[1:]),
+            ),
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO terms (field, term, doc_id) VALUES (?, ?, ?)",
+            [
+                (field, normalize_term(term), doc_id)
+                for field in TERM_FIELDS.values()
+                for term in getattr(document, field)
+                if term.strip()
+            ],
+        )
+
+    def add(
+        self, document: DocumentLike, path: str, mtime: Optional[float] = None
+    ) -> None:
+        """Add or replace the document stored at path."""
+        path = os.path.abspath(path)
+        if mtime is None and os.path.exists(path):
+            mtime = os.path.getmtime(path)
+        with self.conn:
+            self._insert(document, path, mtime)
+
+    def add_many(self, items: Iterable[Tuple[DocumentLike, str]]) -> int:
+        """Add or replace many (document, path) pairs in one transaction."""
+        count = 0
+        with self.conn:
+            for document, path in items:
+                path = os.path.abspath(path)
+                mtime = os.path.getmtime(path) if os.path.exists(path) else None
+                self._insert(document, path, mtime)
+                count += 1
+        return count
+
+    def remove(self, path: str) -> None:
+        """Remove the document stored at path from the index."""
+        path = os.path.abspath(path)
+        with self.conn:
+            self._delete(path)
+
+    def is_current(self, path: str) -> bool:
+        """Check whether path is indexed and unchanged since it was indexed."""
+        path = os.path.abspath(path)
+        row = self.conn.execute(
+            "SELECT mtime FROM documents WHERE path = ?", (path,)
+        ).fetchone()
+        return (
+            row is not None
+            and row[0] is not None
+            and os.path.exists(path)
+            and os.path.getmtime(path) == row[0]
+        )
+
+    def get(self, path: str) -> Optional[FTLDocument]:
+        """Return the indexed document stored at path, if any."""
+        path = os.path.abspath(path)
+        row = self.conn.execute(
+            "SELECT document FROM documents WHERE path = ?", (path,)
+        ).fetchone()
+        return FTLDocument.model_validate_json(row[0]) if row else None
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        tools: Sequence[str] = (),
+        dependencies: Sequence[str] = (),
+        produces: Sequence[str] = (),
+        limit: Optional[int] = 50,
+        fts: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Find documents matching all of the given criteria.
+
+        ``query`` matches documents containing all of its words in any field.
+        With ``fts`` it is instead an FTS5 expression, which may use operators
+        and be scoped to one field (e.g. ``dependencies:python``). ``tools``,
+        ``dependencies`` and ``produces`` match whole entries
+        case-insensitively; a trailing ``*`` matches entries starting with the
+        given text.
+        """
+        if query and not fts:
+            query = quote_query(query)
+        exact: List[Tuple[str, str]] = []
+        clauses: List[str] = []
+        params: List[Any] = []
+        for name, values in (
+            ("tools", tools),
+            ("dependencies", dependencies),
+            ("produces", produces),
+        ):
+            for value in values:
+                term = normalize_term(value.rstrip("*"))
+                if value.endswith("*"):
+                    clauses.append(
+                        "d.id IN (SELECT doc_id FROM terms "
+                        "WHERE field = ? AND term >= ? AND term < ?)"
+                    )
+                    params.extend([TERM_FIELDS[name], term, term + "\uffff"])
+                else:
+                    exact.append((TERM_FIELDS[name], term))
+
+        if query:
+            sql = (
+                "SELECT d.path, d.title FROM documents_fts "
+                "JOIN documents d ON d.id = documents_fts.rowid "
+                "WHERE documents_fts MATCH ?"
+            )
+            params.insert(0, query)
+            order = "bm25(documents_fts)"
+        elif exact:
+            # Drive the query from one term's index range, already in id order,
+            # so a limited search stops early instead of collecting every match
+            sql = (
+                "SELECT d.path, d.title FROM terms t "
+                "JOIN documents d ON d.id = t.doc_id "
+                "WHERE t.field = ? AND t.term = ?"
+            )
+            params[:0] = exact.pop(0)
+            order = "t.doc_id"
+        else:
+            sql = "SELECT d.path, d.title FROM documents d WHERE 1"
+            order = "d.id"
+
+        for field, term in exact:
+            clauses.append(
+                "d.id IN (SELECT doc_id FROM terms WHERE field = ? AND term = ?)"
+            )
+            params.extend([field, term])
+
+        for clause in clauses:
+            sql += f" AND {clause}"
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            rows = self.conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {query!r}: {e}")
+        return [{"path": path, "title": title} for path, title in rows]
@@ -0,0 +1,166 @@
+"""Persistent job journal for resumable batch conversions."""
+
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL,
+    output TEXT,
+    document TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+)
+"""
+
+# Settings a run was started with, checked when it is resumed
+META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+)
+"""
+
+
+class JobJournal:
+    """Records the state of every input in a batch run in SQLite.
+
+    The database runs in WAL mode and commits each state change, so a crash
+    or Ctrl-C loses at most the input being processed. The converted document
+    is stored as soon as the LLM returns, letting a resumed run finish an
+    interrupted input without paying for the LLM call again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(SCHEMA)
+        self.conn.execute(META_SCHEMA)
+
+    def __enter__(self) -> "JobJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    def _update(self, source: str, **fields) -> None:
+        """Set fields on a job and stamp its update time."""
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self.conn.execute(
+            f"UPDATE jobs SET {assignments} WHERE source = ?",
+            (*fields.values(), source),
+        )
+
+    def reset(self) -> None:
+        """Forget all jobs and settings from previous runs."""
+        self.conn.execute("DELETE FROM jobs")
+        self.conn.execute("DELETE FROM meta")
+
+    def get_meta(self, name: str) -> Optional[str]:
+        """Return a setting recorded for the run, if any."""
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str) -> None:
+        """Record a setting for the run."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value)
+        )
+
+    def add(self, source: str, output: str) -> None:
+        """Register an input as pending unless it is already journaled."""
+        self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (source, state, output, updated_at) "
+            "VALUES (?, ?, ?, ?)",
+            (source, PENDING, output, time.time()),
+        )
+
+    def recover(self) -> int:
+        """Return inputs left in flight by an interrupted run to pending."""
+        cursor = self.conn.execute(
+            "UPDATE jobs SET state = ? WHERE state = ?", (PENDING, IN_FLIGHT)
+        )
+        return cursor.rowcount
+
+    def start(self, source: str) -> None:
+        """Mark an input as being processed."""
+        self.conn.execute(
+            "UPDATE jobs SET state = ?, attempts = attempts + 1, error = NULL, "
+            "updated_at = ? WHERE source = ?",
+            (IN_FLIGHT, time.time(), source),
+        )
+
+    def record_document(self, source: str, document: str) -> None:
+        """Store the converted document (JSON) before it is written out."""
+        self._update(source, document=document)
+
+    def discard_document(self, source: str) -> None:
+        """Forget the stored document so the input is converted again."""
+        self._update(source, document=None)
+
+    def finish(self, source: str) -> None:
+        """Mark an input as successfully written."""
+        self._update(source, state=DONE)
+
+    def fail(self, source: str, error: str) -> None:
+        """Mark an input as failed with error details."""
+        self._update(source, state=FAILED, error=error)
+
+    def get(self, source: str) -> Optional[Dict[str, object]]:
+        """Return the journal entry for an input, if any."""
+        cursor = self.conn.execute(
+            "SELECT source, state, output, document, error, attempts "
+            "FROM jobs WHERE source = ?",
+            (source,),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        names = [column[0] for column in cursor.description]
+        return dict(zip(names, row))
+
+    def outputs(self) -> Dict[str, str]:
+        """Return the output path of every journaled input."""
+        rows = self.conn.execute("SELECT source, output FROM jobs ORDER BY id")
+        return dict(rows.fetchall())
+
+    def remaining(self) -> List[str]:
+        """Return inputs that are not done, in the order they were added."""
+        rows = self.conn.execute(
+            "SELECT source FROM jobs WHERE state != ? ORDER BY id", (DONE,)
+        )
+        return [row[0] for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs in each state."""
+        counts = {PENDING: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        for state, count in self.conn.execute(
+            "SELECT state, COUNT(*) FROM jobs GROUP BY state"
+        ):
+            counts[state] = count
+        return counts
+
+    def failures(self) -> List[Dict[str, str]]:
+        """Return failed inputs with their error details."""
+        rows = self.conn.execute(
+            "SELECT source, error FROM jobs WHERE state = ? ORDER BY id", (FAILED,)
+        )
+        return [{"source": source, "error": error} for source, error in rows]
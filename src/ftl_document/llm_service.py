@@ -1,18 +1,59 @@
 """LLM service for transforming documents using litellm."""
 
-import os
-from typing import TYPE_CHECKING
+import asyncio
+import contextvars
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Deque, Dict, List, Optional
 from pathlib import Path
 import litellm
 
+from .tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+
+# Number of primary latency samples needed before the percentile delay is used
+MIN_HEDGE_SAMPLES = 10
+
 
 class LLMService:
-    """Service for calling LLMs to transform documents."""
+    """Service for calling LLMs to transform documents.
 
-    def __init__(self, model: str = "claude-sonnet-4-20250514"):
+    When ``hedge_model`` is set, a request that has not completed within the
+    ``hedge_percentile`` latency of recent primary calls is duplicated to the
+    hedge model (any litellm model, possibly another provider). The first
+    non-empty response wins. Synchronous requests run on daemon threads, so a
+    loser still in flight never delays exit. In the async path a losing hedge
+    is cancelled and a losing primary gets up to ``hedge_delay`` more seconds
+    to finish, so its latency is still measured.
+    """
+
+    def __init__(
+        self,
+        model: str = "claude-sonnet-4-20250514",
+        hedge_model: Optional[str] = None,
+        hedge_percentile: float = 95.0,
+        hedge_delay: float = 30.0,
+        latency_window: int = 100,
+    ):
         """Initialize LLM service with specified model."""
         self.model = model
         self.prompt_dir = Path(__file__).parent / "prompts"
+        self.hedge_model = hedge_model
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._stats_lock = threading.Lock()
+        self.hedge_stats: Dict[str, Any] = {
+            "requests": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "latency_saved": 0.0,
+        }
 
     def load_prompt(self, prompt_name: str) -> str:
         """Load a prompt template from the prompts directory."""
@@ -22,29 +63,228 @@ class LLMService:
 
         return prompt_path.read_text(encoding="utf-8")
 
+    def fingerprint(
+        self, prompt_name: str = "ftl_document", tools_available: str = "tools"
+    ) -> str:
+        """Return a stable fingerprint of the model and prompts used for a transform."""
+        digest = hashlib.sha256()
+        digest.update(self.model.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update((self.hedge_model or "").encode("utf-8"))
+        for name in (prompt_name, tools_available):
+            digest.update(b"\0")
+            digest.update(self.load_prompt(name).encode("utf-8"))
+        return digest.hexdigest()
+
+    @property
+    def hedge_rate(self) -> float:
+        """Fraction of requests that were duplicated to the hedge model."""
+        requests = self.hedge_stats["requests"]
+        return self.hedge_stats["hedged"] / requests if requests else 0.0
+
+    def hedge_delay_seconds(self) -> float:
+        """Return how long to wait for the primary model before hedging."""
+        with self._stats_lock:
+            samples = sorted(self._latencies)
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return self.hedge_delay
+        index = round(self.hedge_percentile / 100 * (len(samples) - 1))
+        return samples[min(index, len(samples) - 1)]
+
+    def _record(self, key: str, amount: Any = 1) -> None:
+        """Increment a hedging statistic."""
+        with self._stats_lock:
+            self.hedge_stats[key] += amount
+
+    def _build_messages(
+        self, input_content: str, prompt_name: str, tools_available: str
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for a document transformation."""
+        system_prompt = self.load_prompt(prompt_name)
+        tools = self.load_prompt(tools_available)
+
+        return [
+            {"role": "system", "content": f"{system_prompt}\n\n{tools}"},
+            {"role": "user", "content": f"Transform this document into a complete ftl-document format. You MUST include detailed Implementation Steps and Verification Steps sections - these cannot be empty. Provide specific, actionable instructions.\n\nDocument to transform:\n\n{input_content}"},
+        ]
+
+    def _complete(self, model: str, messages: List[Dict[str, str]]) -> str:
+        """Call a model and return its stripped response text."""
+        start = time.monotonic()
+        with get_tracer().span("llm.completion", model=model):
+            response = litellm.completion(
+                model=model,
+                messages=messages,
+                temperature=0,  # Low temperature for consistent output
+                max_tokens=4096*4,
+            )
+        result = (response.choices[0].message.content or "").strip()
+        if model == self.model:
+            with self._stats_lock:
+                self._latencies.append(time.monotonic() - start)
+        return result
+
+    async def _acomplete(self, model: str, messages: List[Dict[str, str]]) -> str:
+        """Asynchronously call a model and return its stripped response text."""
+        start = time.monotonic()
+        with get_tracer().span("llm.completion", model=model):
+            response = await litellm.acompletion(
+                model=model,
+                messages=messages,
+                temperature=0,
+                max_tokens=4096*4,
+            )
+        result = (response.choices[0].message.content or "").strip()
+        if model == self.model:
+            with self._stats_lock:
+                self._latencies.append(time.monotonic() - start)
+        return result
+
+    def _start(self, model: str, messages: List[Dict[str, str]]) -> "Future[str]":
+        """Call a model on a daemon thread, returning a future for its text.
+
+        Daemon threads are not joined at interpreter exit, so a losing
+        request still in flight never keeps the process alive. The call runs
+        in a copy of the caller's context to keep span nesting.
+        """
+        future: "Future[str]" = Future()
+        context = contextvars.copy_context()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(context.run(self._complete, model, messages))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"llm-{model}", daemon=True).start()
+        return future
+
+    def _hedged_complete(self, messages: List[Dict[str, str]]) -> str:
+        """Race the primary model against a delayed hedge request."""
+        primary = self._start(self.model, messages)
+        roles = {primary: "primary"}
+        done, _ = wait([primary], timeout=self.hedge_delay_seconds())
+        if not done:
+            roles[self._start(self.hedge_model, messages)] = "hedge"
+            self._record("hedged")
+
+        pending = set(roles)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if not result:
+                    error = RuntimeError(f"Empty response from {roles[future]} model")
+                    continue
+
+                if roles[future] == "hedge":
+                    self._record("hedge_wins")
+                    won_at = time.monotonic()
+                    primary.add_done_callback(lambda f: self._record_saved(f, won_at))
+                return result
+        raise error or RuntimeError("No model returned a response")
+
+    def _record_saved(self, primary: "Future[str]", won_at: float) -> None:
+        """Record how much later the primary finished than the winning hedge."""
+        if not primary.cancelled() and primary.exception() is None:
+            self._record("latency_saved", time.monotonic() - won_at)
+
+    async def _ahedged_complete(self, messages: List[Dict[str, str]]) -> str:
+        """Race the primary model against a delayed hedge request (async)."""
+        start = time.monotonic()
+        primary = asyncio.ensure_future(self._acomplete(self.model, messages))
+        roles = {primary: "primary"}
+        done, _ = await asyncio.wait([primary], timeout=self.hedge_delay_seconds())
+        if not done:
+            roles[asyncio.ensure_future(self._acomplete(self.hedge_model, messages))] = "hedge"
+            self._record("hedged")
+
+        pending = set(roles)
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if not task.result():
+                        error = RuntimeError(f"Empty response from {roles[task]} model")
+                        continue
+                    if roles[task] == "hedge":
+                        self._record("hedge_wins")
+                        if primary in pending:
+                            pending.discard(primary)
+                            self._track_losing_primary(primary, start)
+                    return task.result()
+            raise error or RuntimeError("No model returned a response")
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _track_losing_primary(self, primary: "asyncio.Future[str]", start: float) -> None:
+        """Let a primary beaten by the hedge finish in the background, for a while.
+
+        A primary that finishes records its true latency and saving. One still
+        running after ``hedge_delay`` more seconds (or when the event loop
+        shuts down) is cancelled, and the time it had run is recorded as a
+        lower bound for both, so slow primaries still reach the latency window.
+        """
+        won_at = time.monotonic()
+        timer = asyncio.get_running_loop().call_later(self.hedge_delay, primary.cancel)
+
+        def finished(task: "asyncio.Future[str]") -> None:
+            timer.cancel()
+            now = time.monotonic()
+            if task.cancelled():
+                with self._stats_lock:
+                    self._latencies.append(now - start)
+            elif task.exception() is not None:
+                return
+            self._record("latency_saved", now - won_at)
+
+        primary.add_done_callback(finished)
+
     def transform_document(
         self, input_content: str, prompt_name: str = "ftl_document", tools_available: str = "tools"
     ) -> str:
         """Transform input content using the specified prompt."""
         try:
-            # Load the prompt template
-            system_prompt = self.load_prompt(prompt_name)
-            tools = self.load_prompt(tools_available)
+            messages = self._build_messages(input_content, prompt_name, tools_available)
+            self._record("requests")
 
             # Call the LLM
-            response = litellm.completion(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": f"{system_prompt}\n\n{tools}"},
-                    {"role": "user", "content": f"Transform this document into a complete ftl-document format. You MUST include detailed Implementation Steps and Verification Steps sections - these cannot be empty. Provide specific, actionable instructions.\n\nDocument to transform:\n\n{input_content}"},
-                ],
-                temperature=0,  # Low temperature for consistent output
-                max_tokens=4096*4,
-            )
+            if self.hedge_model:
+                result = self._hedged_complete(messages)
+            else:
+                result = self._complete(self.model, messages)
 
-            result = response.choices[0].message.content.strip()
-            print(result)
+            logger.debug("LLM output:\n%s", result)
             return result
 
         except Exception as e:
             raise RuntimeError(f"LLM transformation failed: {str(e)}")
+
+    async def atransform_document(
+        self, input_content: str, prompt_name: str = "ftl_document", tools_available: str = "tools"
+    ) -> str:
+        """Asynchronously transform input content using the specified prompt."""
+        try:
+            messages = self._build_messages(input_content, prompt_name, tools_available)
+            self._record("requests")
+
+            if self.hedge_model:
+                return await self._ahedged_complete(messages)
+            return await self._acomplete(self.model, messages)
+
+        except Exception as e:
+            raise RuntimeError(f"LLM transformation failed: {str(e)}")
@@ -0,0 +1,116 @@
+"""Fast serialization of FTL documents to and from JSON, YAML and JSON Lines.
+
+YAML uses the libyaml C loader and dumper when PyYAML was built with them.
+FTLDocuments are encoded and decoded with pydantic's native (Rust) JSON
+support; other data uses orjson or msgspec when installed, falling back to
+the standard library.
+"""
+
+import json
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, Optional
+
+import yaml
+
+from .core import DocumentParser, FTLDocument
+
+if TYPE_CHECKING:
+    from .compact import DocumentLike
+
+try:
+    from yaml import CSafeDumper as YamlDumper, CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as YamlDumper, SafeLoader as YamlLoader  # type: ignore
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def dumps_json(data: Any) -> str:
+    """Encode plain data as compact JSON with the fastest available library."""
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    if msgspec is not None:
+        return msgspec.json.encode(data).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads_json(text: str) -> Any:
+    """Decode JSON with the fastest available library."""
+    if orjson is not None:
+        return orjson.loads(text)
+    if msgspec is not None:
+        return msgspec.json.decode(text)
+    return json.loads(text)
+
+
+def dump_yaml(data: Any) -> str:
+    """Encode plain data as block-style YAML."""
+    return yaml.dump(data, Dumper=YamlDumper, default_flow_style=False)
+
+
+def load_yaml(text: str) -> Any:
+    """Decode YAML using the safe loader."""
+    return yaml.load(text, Loader=YamlLoader)
+
+
+def document_from_json(text: str) -> FTLDocument:
+    """Rebuild an FTLDocument from its JSON representation."""
+    return FTLDocument.model_validate_json(text)
+
+
+def document_from_yaml(text: str) -> FTLDocument:
+    """Rebuild an FTLDocument from its YAML representation."""
+    return FTLDocument.model_validate(load_yaml(text))
+
+
+def load_document(text: str, format: str) -> FTLDocument:
+    """Rebuild an FTLDocument from markdown, json or yaml without the LLM."""
+    if format == "json":
+        return document_from_json(text)
+    if format == "yaml":
+        return document_from_yaml(text)
+    if format == "markdown":
+        return DocumentParser().parse_ftl(text)
+    raise ValueError(f"Unsupported format: {format}")
+
+
+def write_jsonl(documents: Iterable["DocumentLike"], stream: IO[str]) -> int:
+    """Write documents to a text stream as JSON Lines; return the count."""
+    count = 0
+    for document in documents:
+        stream.write(document.model_dump_json())
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def iter_jsonl(stream: IO[str]) -> Iterator[FTLDocument]:
+    """Lazily read FTLDocuments from a JSON Lines text stream."""
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield FTLDocument.model_validate_json(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid document on line {number}: {e}")
+
+
+def format_for_path(path: str) -> Optional[str]:
+    """Guess the serialization format from a file name."""
+    lowered = path.lower()
+    if lowered.endswith(".json"):
+        return "json"
+    if lowered.endswith((".yaml", ".yml")):
+        return "yaml"
+    if lowered.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if lowered.endswith((".md", ".markdown")):
+        return "markdown"
+    return None
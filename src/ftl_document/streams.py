@@ -0,0 +1,95 @@
+"""Chunked readers for files, stdin and HTTP responses.
+
+Inputs are consumed as an iterator of byte chunks and decoded incrementally,
+so preprocessing can start before the whole input has arrived and the raw
+bytes never need to be held in memory at once. Regular files are read
+through a memory map, leaving paging to the operating system.
+"""
+
+import codecs
+import mmap
+import os
+import stat
+from typing import IO, Iterable, Iterator, Tuple
+
+# Input source name meaning standard input
+STDIN = "-"
+
+CHUNK_SIZE = 64 * 1024
+
+# Bytes read ahead of processing to detect the input format
+SNIFF_SIZE = 64 * 1024
+
+# Seekable input (DOCX) read from a pipe is kept in memory up to this size,
+# then spooled to a temporary file
+SPOOL_SIZE = 8 * 1024 * 1024
+
+
+def iter_chunks(stream: IO[bytes], size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield byte chunks from a binary stream until EOF."""
+    while True:
+        chunk = stream.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_file_chunks(path: str, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield byte chunks of a file, through a read-only memory map if possible.
+
+    Pipes, FIFOs and devices (e.g. ``<(curl ...)`` or ``/dev/stdin``) cannot
+    be mapped and report no size, so they are read sequentially instead.
+    """
+    with open(path, "rb") as f:
+        info = os.fstat(f.fileno())
+        if not stat.S_ISREG(info.st_mode) or info.st_size == 0:
+            yield from iter_chunks(f, size)
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, len(mapped), size):
+                yield mapped[offset : offset + size]
+
+
+def split_head(
+    chunks: Iterable[bytes], size: int = SNIFF_SIZE
+) -> Tuple[bytes, Iterator[bytes]]:
+    """Read at least size bytes (or everything) from chunks.
+
+    Returns the bytes read and an iterator over the remaining chunks.
+    """
+    chunks = iter(chunks)
+    head = []
+    length = 0
+    for chunk in chunks:
+        head.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            break
+    return b"".join(head), chunks
+
+
+def iter_text(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Decode byte chunks, joining characters split across chunk boundaries."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def iter_lines(text: Iterable[str]) -> Iterator[str]:
+    """Split decoded text chunks into lines, without line endings."""
+    partial = []
+    for chunk in text:
+        if "\n" not in chunk:
+            partial.append(chunk)
+            continue
+        lines = chunk.split("\n")
+        partial.append(lines[0])
+        yield "".join(partial)
+        yield from lines[1:-1]
+        partial = [lines[-1]]
+    yield "".join(partial)
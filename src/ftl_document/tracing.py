@@ -0,0 +1,291 @@
+"""Timed tracing spans and profiling for the document pipeline.
+
+Spans are recorded in memory and can be exported in the OpenTelemetry
+OTLP/JSON format, either to a local file or to a collector's HTTP endpoint.
+"""
+
+import cProfile
+import functools
+import io
+import json
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+import requests
+
+F = TypeVar("F", bound=Callable[..., Any])
+T = TypeVar("T")
+
+SERVICE_NAME = "ftl-document"
+
+
+class Span:
+    """A single timed operation in the pipeline."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        attributes: Dict[str, Any],
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Duration of the span in seconds."""
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Convert the span to an OTLP/JSON span object."""
+        span: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """Encode an attribute as an OTLP key/value pair."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def _new_id(bits: int) -> str:
+    """Return a random hex id; not cryptographic, but cheap and unique enough."""
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+# Returned by a disabled tracer; reusable and re-entrant
+_NO_SPAN = nullcontext()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("ftl_current_span", default=None)
+
+
+class Tracer:
+    """Records nested, timed spans around pipeline stages.
+
+    A disabled tracer records nothing, and its spans cost a single attribute
+    check, so instrumented code runs at full speed unless tracing is on.
+    """
+
+    def __init__(self, max_spans: int = 10000, enabled: bool = True):
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[Optional[Span]]:
+        """Time the enclosed block as a span nested under the current one."""
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(name, attributes)
+
+    @contextmanager
+    def _span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        """Record a span around the enclosed block."""
+        parent = _current_span.get()
+        trace_id = parent.trace_id if parent else _new_id(128)
+        span = Span(name, trace_id, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def iter_span(self, name: str, items: Iterable[T], **attributes: Any) -> Iterator[T]:
+        """Yield from items, recording the time spent waiting on them as a span.
+
+        The consumer does its own work between items, so the span starts at
+        the first item and lasts only as long as was spent inside the
+        iterator (e.g. reading input), not until the last item arrived.
+        """
+        if not self.enabled:
+            return iter(items)
+        parent = _current_span.get()
+        return self._iter_span(name, items, parent, attributes)
+
+    def _iter_span(
+        self,
+        name: str,
+        items: Iterable[T],
+        parent: Optional[Span],
+        attributes: Dict[str, Any],
+    ) -> Iterator[T]:
+        """Generator behind iter_span, parented to the span current at creation."""
+        trace_id = parent.trace_id if parent else _new_id(128)
+        span = Span(name, trace_id, parent.span_id if parent else None, attributes)
+        iterator = iter(items)
+        waited = 0
+        try:
+            while True:
+                start = time.time_ns()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                except BaseException as e:
+                    span.error = f"{type(e).__name__}: {e}"
+                    raise
+                finally:
+                    waited += time.time_ns() - start
+                yield item
+        finally:
+            span.end_ns = span.start_ns + waited
+            with self._lock:
+                self.spans.append(span)
+
+    def clear(self) -> None:
+        """Discard all recorded spans."""
+        with self._lock:
+            self.spans.clear()
+
+    def summary(self) -> Dict[str, float]:
+        """Return total seconds spent per span name."""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for span in self.spans:
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration
+        return totals
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Return recorded spans as an OTLP/JSON ExportTraceServiceRequest."""
+        with self._lock:
+            spans: List[Dict[str, Any]] = [span.to_otlp() for span in self.spans]
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otlp_attribute("service.name", SERVICE_NAME)]
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": "ftl_document"}, "spans": spans}
+                    ],
+                }
+            ]
+        }
+
+    def export_file(self, path: str) -> None:
+        """Append recorded spans to a file as one OTLP/JSON line."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_otlp()) + "\n")
+
+    def export_collector(self, endpoint: str, timeout: float = 10.0) -> None:
+        """Send recorded spans to an OTLP/HTTP collector (e.g. .../v1/traces)."""
+        response = requests.post(endpoint, json=self.to_otlp(), timeout=timeout)
+        response.raise_for_status()
+
+
+# Off until a trace or profile is requested (e.g. by the CLI options)
+_tracer = Tracer(enabled=False)
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer used by the pipeline."""
+    return _tracer
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Record each call of the decorated function as a span on the default tracer."""
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _tracer.enabled:
+                return fn(*args, **kwargs)
+            with _tracer.span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@contextmanager
+def profile(path: str, limit: int = 30) -> Iterator[None]:
+    """Profile the enclosed block with cProfile and tracemalloc.
+
+    Writes ``<path>.prof`` (loadable with pstats or snakeviz) and a readable
+    ``<path>.txt`` report with the top functions and allocation sites.
+    """
+    profiler = cProfile.Profile()
+    started_tracemalloc = not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+        profiler.dump_stats(f"{path}.prof")
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats("cumulative").print_stats(limit)
+        report.write(f"\nMemory: current={current} bytes peak={peak} bytes\n")
+        report.write(f"\nTop {limit} allocation sites:\n")
+        for stat in snapshot.statistics("lineno")[:limit]:
+            report.write(f"{stat}\n")
+        with open(f"{path}.txt", "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
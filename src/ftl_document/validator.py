@@ -1,7 +1,8 @@
 """Validation utilities for FTL Documents."""
 
 from typing import List, Dict, Any
-from .core import FTLDocument
+from .compact import DocumentLike
+from .tracing import traced
 
 
 class ValidationError(Exception):
@@ -21,7 +22,8 @@ class DocumentValidator:
             "verification_steps",
         ]
 
-    def validate(self, document: FTLDocument) -> Dict[str, Any]:
+    @traced("validator.validate")
+    def validate(self, document: DocumentLike) -> Dict[str, Any]:
         """Validate an FTL document and return validation results."""
         results = {"valid": True, "errors": [], "warnings": [], "score": 0}
 
@@ -48,14 +50,14 @@ class DocumentValidator:
 
         return results
 
-    def _has_content(self, document: FTLDocument, field_name: str) -> bool:
+    def _has_content(self, document: DocumentLike, field_name: str) -> bool:
         """Check if a field has meaningful content."""
         value = getattr(document, field_name, None)
         if value is None:
             return False
         if isinstance(value, str):
             return bool(value.strip())
-        if isinstance(value, list):
+        if isinstance(value, (list, tuple)):
             return len(value) > 0
         return bool(value)
 
@@ -77,7 +79,7 @@ class DocumentValidator:
 
         return warnings
 
-    def _calculate_score(self, document: FTLDocument, results: Dict[str, Any]) -> int:
+    def _calculate_score(self, document: DocumentLike, results: Dict[str, Any]) -> int:
         """Calculate a quality score for the document (0-100)."""
         score = 100
 
@@ -97,7 +99,7 @@ class DocumentValidator:
 
         return max(0, min(100, score))
 
-    def validate_and_raise(self, document: FTLDocument) -> None:
+    def validate_and_raise(self, document: DocumentLike) -> None:
         """Validate document and raise ValidationError if invalid."""
         results = self.validate(document)
         if not results["valid"]:
@@ -0,0 +1,43 @@
+"""Sample inputs shared by several test modules."""
+
+import zipfile
+
+FTL_DOCUMENT = """# Install Nginx
+
+## Requirements
+- Ubuntu 22.04
+
+## Tools Needed
+- apt_tool
+
+## Implementation Steps
+1. Install the nginx package with apt
+2. Enable and start the nginx service
+
+## Verification Steps
+- curl http://localhost returns the welcome page
+"""
+
+NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def docx_paragraph(text, style=None, num_id=None, level=0):
+    """Build a w:p element with optional style and list numbering."""
+    props = ""
+    if style:
+        props += f'<w:pStyle w:val="{style}"/>'
+    if num_id:
+        props += f'<w:numPr><w:ilvl w:val="{level}"/><w:numId w:val="{num_id}"/></w:numPr>'
+    return f"<w:p><w:pPr>{props}</w:pPr><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def write_docx(path, body, numbering=None):
+    """Write a minimal DOCX archive containing the given body XML."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            "word/document.xml",
+            f"<w:document {NS}><w:body>{body}<w:sectPr/></w:body></w:document>",
+        )
+        if numbering:
+            archive.writestr("word/numbering.xml", f"<w:numbering {NS}>{numbering}</w:numbering>")
+    return str(path)
@@ -0,0 +1,112 @@
+"""Tests for single-flight coalescing of LLM calls."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from ftl_document.coalesce import SingleFlight, make_key
+from ftl_document.core import DocumentParser
+
+
+class TestSingleFlight:
+    """Test SingleFlight class."""
+
+    def test_make_key_normalizes_content(self):
+        """Test that whitespace-only differences share a key."""
+        assert make_key("# Doc\r\nline  \n", "fp") == make_key("# Doc\nline", "fp")
+        assert make_key("# Doc", "fp") != make_key("# Doc", "other")
+
+    def test_concurrent_calls_share_result(self):
+        """Test that concurrent identical calls run the function once."""
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def slow():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return "result"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+        leader.start()
+        started.wait()
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+            for _ in range(4)
+        ]
+        for thread in followers:
+            thread.start()
+        for thread in [leader] + followers:
+            thread.join()
+
+        assert results == ["result"] * 5
+        assert len(calls) == 1
+        assert flight.stats == {"calls": 1, "coalesced": 4}
+        assert flight.calls_saved == 4
+
+    def test_errors_propagate_and_key_is_released(self):
+        """Test that errors reach the caller and later calls start fresh."""
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flight.do("k", fail)
+
+        assert flight.do("k", lambda: "ok") == "ok"
+        assert flight.stats["calls"] == 2
+
+    def test_async_calls_share_result(self):
+        """Test that concurrent identical coroutines await one call."""
+        flight = SingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def run():
+            return await asyncio.gather(
+                *(flight.do_async("k", slow) for _ in range(3))
+            )
+
+        assert asyncio.run(run()) == ["result"] * 3
+        assert len(calls) == 1
+        assert flight.stats == {"calls": 1, "coalesced": 2}
+
+
+class TestDocumentParserCoalescing:
+    """Test that DocumentParser coalesces identical LLM requests."""
+
+    def test_parse_with_llm_coalesces(self, monkeypatch):
+        """Test that concurrent identical parses make one LLM call."""
+        parser = DocumentParser(single_flight=SingleFlight())
+        calls = []
+
+        def transform(content):
+            calls.append(content)
+            time.sleep(0.1)
+            return "# Coalesced\n\n**Implementation Steps**\n1. Do it"
+
+        monkeypatch.setattr(parser.llm_service, "transform_document", transform)
+
+        documents = []
+        threads = [
+            threading.Thread(
+                target=lambda: documents.append(parser.parse_with_llm("same input"))
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert [doc.title for doc in documents] == ["Coalesced"] * 3
+        assert parser.single_flight.calls_saved == 2
@@ -0,0 +1,94 @@
+"""Tests for the compact read-only document representation."""
+
+import io
+import json
+
+import pytest
+from ftl_document.compact import CompactDocument, compact, iter_compact_jsonl
+from ftl_document.core import FTLDocument
+from ftl_document.generator import DocumentGenerator
+from ftl_document.index import DocumentIndex
+from ftl_document.validator import DocumentValidator
+
+
+class TestCompactDocument:
+    """Test CompactDocument class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.document = FTLDocument(
+            title="Secure a server",
+            dependencies=["Python 3.8+"],
+            tools_required=["firewalld_tool", "user_tool"],
+            questions=["Which user?"],
+            implementation_steps=["1. Create the user", "2. Open the firewall"],
+            verification_steps=["- Log in as the user"],
+            produces=["A hardened server"],
+            metadata={"source": "secure.md"},
+        )
+        self.compact = CompactDocument.from_document(self.document)
+
+    def test_lossless_round_trip(self):
+        """Test conversion to and from FTLDocument."""
+        assert self.compact.to_document() == self.document
+        assert self.compact.model_dump() == self.document.model_dump()
+        assert json.loads(self.compact.model_dump_json()) == json.loads(
+            self.document.model_dump_json()
+        )
+
+    def test_read_only(self):
+        """Test that fields cannot be reassigned or mutated."""
+        with pytest.raises(AttributeError):
+            self.compact.title = "Other"
+        with pytest.raises(AttributeError):
+            self.compact.tools_required.append("apt_tool")
+        self.compact.metadata["source"] = "changed"
+        assert self.compact.metadata == {"source": "secure.md"}
+
+    def test_names_are_interned(self):
+        """Test that repeated tool names share one string object."""
+        first = CompactDocument("A", tools_required=["".join(["apt", "_tool"])])
+        second = CompactDocument("B", tools_required=["".join(["apt", "_t", "ool"])])
+
+        assert first.tools_required[0] is second.tools_required[0]
+
+    def test_rejects_bad_fields(self):
+        """Test the lightweight type checks."""
+        with pytest.raises(TypeError):
+            CompactDocument("A", tools_required="apt_tool")
+        with pytest.raises(TypeError):
+            CompactDocument("A", dependencies=[1])
+        with pytest.raises(ValueError):
+            CompactDocument.from_dict({"dependencies": []})
+
+    def test_compact_is_idempotent(self):
+        """Test the compact() helper."""
+        assert compact(self.compact) is self.compact
+        assert compact(self.document) == self.compact
+
+    def test_validator_accepts_compact(self):
+        """Test that validation results match the pydantic path."""
+        validator = DocumentValidator()
+
+        assert validator.validate(self.compact) == validator.validate(self.document)
+        assert validator.validate(CompactDocument(""))["valid"] is False
+
+    def test_generator_accepts_compact(self):
+        """Test that every output format matches the pydantic path."""
+        generator = DocumentGenerator()
+
+        for method in ("generate_markdown", "generate_json", "generate_yaml"):
+            render = getattr(generator, method)
+            assert render(self.compact) == render(self.document)
+
+    def test_index_accepts_compact(self):
+        """Test that compact documents can be indexed directly."""
+        with DocumentIndex(":memory:") as index:
+            index.add(self.compact, "/docs/secure.md")
+            assert index.get("/docs/secure.md") == self.document
+
+    def test_iter_compact_jsonl(self):
+        """Test bulk loading compact documents from JSON Lines."""
+        stream = io.StringIO(self.document.model_dump_json() + "\n\n")
+
+        assert list(iter_compact_jsonl(stream)) == [self.compact]
@@ -53,9 +53,6 @@ class TestDocumentParser:
         with pytest.raises(NotImplementedError):
             parser.parse_markdown("# Test")
 
-        with pytest.raises(NotImplementedError):
-            parser.parse_docx("test.docx")
-
         with pytest.raises(NotImplementedError):
             parser.parse_text("Test content")
 
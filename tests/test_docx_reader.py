@@ -0,0 +1,90 @@
+"""Tests for streaming DOCX ingestion."""
+
+from ftl_document.core import DocumentParser
+from ftl_document.docx_reader import docx_to_markdown, iter_docx_markdown
+
+from tests.samples import docx_paragraph, write_docx
+
+NUMBERING = (
+    '<w:abstractNum w:abstractNumId="0"><w:lvl w:ilvl="0"><w:numFmt w:val="bullet"/></w:lvl></w:abstractNum>'
+    '<w:abstractNum w:abstractNumId="1"><w:lvl w:ilvl="0"><w:numFmt w:val="decimal"/></w:lvl></w:abstractNum>'
+    '<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>'
+    '<w:num w:numId="2"><w:abstractNumId w:val="1"/></w:num>'
+)
+
+
+class TestDocxReader:
+    """Test DOCX to markdown conversion."""
+
+    def test_headings_and_paragraphs(self, tmp_path):
+        """Test that heading styles become markdown headings."""
+        path = write_docx(
+            tmp_path / "doc.docx",
+            docx_paragraph("Install Nginx", style="Title")
+            + docx_paragraph("Overview", style="Heading2")
+            + docx_paragraph("Some text.")
+            + docx_paragraph(""),
+        )
+
+        assert docx_to_markdown(path) == "# Install Nginx\n\n## Overview\nSome text."
+
+    def test_lists(self, tmp_path):
+        """Test that bullet and numbered lists keep their markers."""
+        path = write_docx(
+            tmp_path / "doc.docx",
+            docx_paragraph("Bullet", num_id="1")
+            + docx_paragraph("Nested", num_id="1", level=1)
+            + docx_paragraph("Numbered", num_id="2"),
+            numbering=NUMBERING,
+        )
+
+        assert docx_to_markdown(path) == "- Bullet\n  - Nested\n1. Numbered"
+
+    def test_tables(self, tmp_path):
+        """Test that tables become markdown tables."""
+        row = "<w:tr><w:tc>{}</w:tc><w:tc>{}</w:tc></w:tr>"
+        table = (
+            "<w:tbl>"
+            + row.format(docx_paragraph("Port"), docx_paragraph("Service"))
+            + row.format(docx_paragraph("22"), docx_paragraph("ssh | sftp"))
+            + "</w:tbl>"
+        )
+        path = write_docx(tmp_path / "doc.docx", table)
+
+        assert docx_to_markdown(path) == (
+            "| Port | Service |\n| --- | --- |\n| 22 | ssh \\| sftp |"
+        )
+
+    def test_images_and_styling_are_dropped(self, tmp_path):
+        """Test that drawings and run formatting never reach the output."""
+        body = (
+            "<w:p><w:r><w:rPr><w:b/></w:rPr><w:t>Bold</w:t></w:r>"
+            "<w:r><w:drawing><w:t>alt text</w:t></w:drawing></w:r>"
+            "<w:r><w:tab/><w:t>text</w:t></w:r></w:p>"
+        )
+        path = write_docx(tmp_path / "doc.docx", body)
+
+        assert docx_to_markdown(path) == "Bold text"
+
+    def test_streams_from_file_object(self, tmp_path):
+        """Test conversion from an open binary stream."""
+        path = write_docx(tmp_path / "doc.docx", docx_paragraph("Hello"))
+
+        with open(path, "rb") as stream:
+            assert list(iter_docx_markdown(stream)) == ["Hello"]
+
+
+def test_parse_docx_uses_llm(tmp_path, monkeypatch):
+    """Test that parse_docx sends the converted markdown to the LLM."""
+    path = write_docx(tmp_path / "doc.docx", docx_paragraph("Setup", style="Heading1"))
+    parser = DocumentParser()
+    seen = []
+
+    def parse_with_llm(content):
+        seen.append(content)
+        return "parsed"
+
+    monkeypatch.setattr(parser, "parse_with_llm", parse_with_llm)
+
+    assert parser.parse_docx(path) == "parsed"
+    assert seen == ["# Setup"]
@@ -0,0 +1,158 @@
+"""Tests for input format sniffing and preprocessing."""
+
+from pathlib import Path
+
+import pytest
+from ftl_document.core import DocumentParser
+from ftl_document.formats import (
+    html_chunks_to_markdown,
+    html_to_markdown,
+    normalize_format,
+    normalize_lines,
+    normalize_text,
+    sniff_format,
+)
+
+from tests.samples import FTL_DOCUMENT
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+
+
+class TestSniffFormat:
+    """Test sniff_format function."""
+
+    def test_ftl(self):
+        """Test that FTL documents are recognized."""
+        assert sniff_format(FTL_DOCUMENT) == "ftl"
+        assert sniff_format((EXAMPLES / "linode.md").read_text()) == "ftl"
+
+    def test_html(self):
+        """Test that HTML documents are recognized."""
+        assert sniff_format("<!DOCTYPE html><html><body>Hi</body></html>") == "html"
+        assert sniff_format("<div><h1>Title</h1><p>Text</p></div>") == "html"
+
+    def test_markdown(self):
+        """Test that ordinary markdown is not mistaken for FTL."""
+        assert sniff_format("# Guide\n\n- install it\n- run it\n") == "markdown"
+
+    def test_markdown_quoting_html(self):
+        """Test that HTML in fenced or inline markdown does not make it HTML."""
+        content = (
+            "# Deploy nginx\n\n"
+            "1. Install nginx:\n```bash\nsudo apt install nginx\n```\n"
+            "2. Create index.html:\n```html\n<div><h1>Hello</h1><p>Hi</p></div>\n```\n"
+        )
+
+        assert sniff_format(content) == "markdown"
+
+    def test_text(self):
+        """Test that plain prose falls back to text."""
+        assert sniff_format("Install nginx and then start it.") == "text"
+
+    def test_docx_bytes(self):
+        """Test that zip content is treated as DOCX."""
+        assert sniff_format(b"PK\x03\x04rest") == "docx"
+
+    def test_normalize_format(self):
+        """Test format hint aliases."""
+        assert normalize_format("md") == "markdown"
+        assert normalize_format("TXT") == "text"
+        assert normalize_format(None) is None
+        with pytest.raises(ValueError):
+            normalize_format("pdf")
+
+
+def test_html_to_markdown():
+    """Test that HTML is reduced to compact markdown."""
+    html = (
+        "<html><head><style>p {}</style></head><body>"
+        "<h2>Setup</h2><script>track()</script>"
+        "<ul><li>Install   nginx</li><li>Start it</li></ul>"
+        "<pre>  indented\ncode</pre></body></html>"
+    )
+
+    assert html_to_markdown(html) == (
+        "## Setup\n\n- Install nginx\n- Start it\n\n```\n  indented\ncode\n```"
+    )
+
+    chunks = [html[i : i + 5] for i in range(0, len(html), 5)]
+    assert html_chunks_to_markdown(chunks) == html_to_markdown(html)
+
+
+def test_normalize_lines():
+    """Test that line-by-line normalization matches normalize_text."""
+    text = "\n\n  Title  \r\n\r\n\r\nBody\t\n\n\nEnd\n\n"
+
+    assert normalize_text(text) == "Title\n\nBody\n\nEnd"
+    assert normalize_lines(text.split("\n")) == normalize_text(text)
+
+
+class TestAutoParse:
+    """Test DocumentParser.auto_parse routing."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.parser = DocumentParser()
+        self.llm_inputs = []
+        self.parser.parse_with_llm = self.llm_inputs.append
+
+    def test_ftl_skips_llm(self):
+        """Test that valid FTL input never reaches the LLM."""
+        document = self.parser.auto_parse(FTL_DOCUMENT)
+
+        assert self.llm_inputs == []
+        assert self.parser.llm_calls_skipped == 1
+        assert document.title == "Install Nginx"
+        assert document.tools_required == ["apt_tool"]
+        assert len(document.implementation_steps) == 2
+
+    def test_invalid_ftl_uses_llm(self):
+        """Test that FTL-like input without steps still goes to the LLM."""
+        content = "# Draft\n\n## Requirements\n- x\n\n## Tools Needed\n- y\n\n## Implementation Steps\n"
+        self.parser.auto_parse(content)
+
+        assert len(self.llm_inputs) == 1
+        assert self.parser.llm_calls_skipped == 0
+
+    def test_html_is_preprocessed(self):
+        """Test that HTML is converted before the LLM call."""
+        self.parser.auto_parse("<html><body><h1>Guide</h1><p>Do it</p></body></html>")
+
+        assert self.llm_inputs == ["# Guide\n\nDo it"]
+
+    def test_format_hint_overrides_sniffing(self):
+        """Test that an explicit hint bypasses detection."""
+        self.parser.auto_parse(FTL_DOCUMENT, format_hint="text")
+
+        assert len(self.llm_inputs) == 1
+
+
+def test_subheadings_stay_in_their_section():
+    """Test that ### headings inside a section do not switch sections."""
+    content = """# Install Nginx
+
+## Requirements
+- Ubuntu
+
+## Implementation Steps
+1. apt install nginx
+### Check system requirements
+2. free -m
+### Install the tools
+3. edit config
+
+## Verification Steps
+- curl localhost
+"""
+    document = DocumentParser().parse_ftl(content)
+
+    assert document.dependencies == ["Ubuntu"]
+    assert document.tools_required == []
+    assert document.implementation_steps == [
+        "1. apt install nginx",
+        "### Check system requirements",
+        "2. free -m",
+        "### Install the tools",
+        "3. edit config",
+    ]
+    assert document.verification_steps == ["- curl localhost"]
@@ -1,5 +1,7 @@
 """Tests for FTL Document generator."""
 
+import io
+
 import pytest
 from ftl_document.core import FTLDocument
 from ftl_document.generator import DocumentGenerator
@@ -76,3 +78,57 @@ class TestDocumentGenerator:
         """Test handling of empty lists."""
         assert self.generator._format_list_section([]) == ""
         assert self.generator._format_numbered_list([]) == ""
+
+
+def test_save_to_file_is_atomic(tmp_path, monkeypatch):
+    """Test that a failed write leaves the previous file untouched."""
+    generator = DocumentGenerator()
+    document = FTLDocument(title="Atomic", implementation_steps=["Step 1"])
+    path = tmp_path / "doc.md"
+    path.write_text("previous")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("os.replace", fail)
+    with pytest.raises(OSError):
+        generator.save_to_file(document, str(path))
+
+    assert path.read_text() == "previous"
+    assert list(tmp_path.iterdir()) == [path]
+
+    monkeypatch.undo()
+    generator.save_to_file(document, str(path))
+    assert path.read_text().startswith("# Atomic")
+
+
+def test_write_streams_sections():
+    """Test that write emits markdown in pieces matching generate_markdown."""
+    generator = DocumentGenerator()
+    document = FTLDocument(
+        title="Stream",
+        tools_required=["apt_tool"],
+        implementation_steps=["1. Install", "2. Start"],
+    )
+    pieces = list(generator.iter_markdown(document))
+    stream = io.StringIO()
+    generator.write(document, stream)
+
+    assert len(pieces) > 1
+    assert "".join(pieces) == stream.getvalue() == generator.generate_markdown(document)
+    assert stream.getvalue().endswith("## Produces")
+    with pytest.raises(ValueError):
+        generator.write(document, stream, "toml")
+
+
+def test_save_to_file_keeps_mode(tmp_path):
+    """Test that replacing a file keeps its permissions."""
+    generator = DocumentGenerator()
+    document = FTLDocument(title="Mode", implementation_steps=["Step 1"])
+    path = tmp_path / "doc.md"
+    path.write_text("previous")
+    path.chmod(0o640)
+
+    generator.save_to_file(document, str(path))
+
+    assert path.stat().st_mode & 0o777 == 0o640
@@ -0,0 +1,120 @@
+"""Tests for the searchable document index."""
+
+import os
+
+import pytest
+from click.testing import CliRunner
+from ftl_document import cli
+from ftl_document.core import FTLDocument
+from ftl_document.index import DocumentIndex
+
+
+class TestDocumentIndex:
+    """Test DocumentIndex class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.index = DocumentIndex(":memory:")
+        self.index.add(
+            FTLDocument(
+                title="Secure a server",
+                dependencies=["Python 3.8+", "SSH access"],
+                tools_required=["firewalld_tool", "user_tool"],
+                implementation_steps=["Open port 22 with firewalld"],
+                produces=["A hardened server"],
+            ),
+            "/docs/secure.md",
+        )
+        self.index.add(
+            FTLDocument(
+                title="Install nginx",
+                dependencies=["Python 3.10"],
+                tools_required=["apt_tool"],
+                implementation_steps=["Install the nginx package"],
+                produces=["A running web server"],
+            ),
+            "/docs/nginx.md",
+        )
+
+    def teardown_method(self):
+        """Close the index."""
+        self.index.close()
+
+    def _paths(self, **kwargs):
+        return [result["path"] for result in self.index.search(**kwargs)]
+
+    def test_search_by_tool(self):
+        """Test exact, case-insensitive tool lookups."""
+        assert self._paths(tools=["FIREWALLD_TOOL"]) == ["/docs/secure.md"]
+        assert self._paths(tools=["missing_tool"]) == []
+
+    def test_search_by_prefix(self):
+        """Test prefix lookups on inverted fields."""
+        assert sorted(self._paths(dependencies=["python 3*"])) == [
+            "/docs/nginx.md",
+            "/docs/secure.md",
+        ]
+        assert self._paths(produces=["a hardened*"]) == ["/docs/secure.md"]
+
+    def test_full_text_query(self):
+        """Test FTS queries, optionally scoped to a field."""
+        assert self._paths(query="nginx") == ["/docs/nginx.md"]
+        assert self._paths(query="implementation_steps:firewalld", fts=True) == [
+            "/docs/secure.md"
+        ]
+
+    def test_combined_criteria(self):
+        """Test that all criteria must match."""
+        assert self._paths(query="server", tools=["apt_tool"]) == ["/docs/nginx.md"]
+
+    def test_replace_and_remove(self):
+        """Test that re-adding a path replaces it and remove drops it."""
+        self.index.add(
+            FTLDocument(title="Install nginx v2", tools_required=["dnf_tool"]),
+            "/docs/nginx.md",
+        )
+
+        assert len(self.index) == 2
+        assert self._paths(tools=["apt_tool"]) == []
+        assert self.index.get("/docs/nginx.md").title == "Install nginx v2"
+
+        self.index.remove("/docs/nginx.md")
+        assert len(self.index) == 1
+        assert self._paths(query="nginx") == []
+
+    def test_query_punctuation_is_literal(self):
+        """Test that plain queries with FTS5 punctuation are searched as text."""
+        assert self._paths(query="python 3.8+") == ["/docs/secure.md"]
+        assert self._paths(query="firewalld_tool user_tool") == ["/docs/secure.md"]
+        assert self._paths(query="nginx-package") == ["/docs/nginx.md"]
+        assert self._paths(query="nginx-1.2") == []
+        assert self._paths(query='C++ "unterminated') == []
+
+    def test_invalid_query(self):
+        """Test that malformed FTS syntax raises ValueError."""
+        with pytest.raises(ValueError):
+            self.index.search(query='"unterminated', fts=True)
+
+    def test_is_current(self, tmp_path):
+        """Test change detection used for incremental indexing."""
+        path = tmp_path / "doc.md"
+        path.write_text("# Doc")
+        self.index.add(FTLDocument(title="Doc"), str(path))
+
+        assert self.index.is_current(str(path))
+        os.utime(path, (0, 0))
+        assert not self.index.is_current(str(path))
+
+
+def test_generate_index_requires_output(tmp_path):
+    """Test that --index is rejected when the document goes to stdout."""
+    source = tmp_path / "doc.md"
+    source.write_text("# Doc")
+
+    result = CliRunner().invoke(
+        cli.main, ["generate", str(source), "--index", str(tmp_path / "i.db")]
+    )
+
+    assert result.exit_code == 2
+    assert "--index requires --output" in result.output
+    assert not (tmp_path / "i.db").exists()
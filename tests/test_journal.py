@@ -0,0 +1,173 @@
+"""Tests for the batch job journal and resumable batch runs."""
+
+from click.testing import CliRunner
+from ftl_document import cli
+from ftl_document.core import DocumentParser
+from ftl_document.journal import DONE, FAILED, IN_FLIGHT, PENDING, JobJournal
+
+FTL_OUTPUT = "# Converted\n\n## Implementation Steps\n1. First step here\n2. Second step here"
+
+
+class TestJobJournal:
+    """Test JobJournal class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.journal = JobJournal(":memory:")
+        self.journal.add("a.md", "out/a.md")
+        self.journal.add("b.md", "out/b.md")
+
+    def teardown_method(self):
+        """Close the journal."""
+        self.journal.close()
+
+    def test_state_transitions(self):
+        """Test that inputs move through pending, in flight, done and failed."""
+        self.journal.start("a.md")
+        assert self.journal.get("a.md")["state"] == IN_FLIGHT
+
+        self.journal.finish("a.md")
+        self.journal.start("b.md")
+        self.journal.fail("b.md", "RuntimeError: provider down")
+
+        assert self.journal.counts() == {PENDING: 0, IN_FLIGHT: 0, DONE: 1, FAILED: 1}
+        assert self.journal.failures() == [
+            {"source": "b.md", "error": "RuntimeError: provider down"}
+        ]
+        assert self.journal.remaining() == ["b.md"]
+        assert self.journal.get("b.md")["attempts"] == 1
+
+    def test_add_keeps_existing_state(self):
+        """Test that re-adding an input does not reset its progress."""
+        self.journal.start("a.md")
+        self.journal.finish("a.md")
+        self.journal.add("a.md", "out/a.md")
+
+        assert self.journal.get("a.md")["state"] == DONE
+
+    def test_recover_interrupted(self):
+        """Test that in-flight inputs from a crashed run become pending."""
+        self.journal.start("a.md")
+        self.journal.record_document("a.md", '{"title": "A"}')
+
+        assert self.journal.recover() == 1
+        entry = self.journal.get("a.md")
+        assert entry["state"] == PENDING
+        assert entry["document"] == '{"title": "A"}'
+
+    def test_meta_and_outputs(self):
+        """Test that run settings and output paths are recorded until reset."""
+        self.journal.set_meta("format", "json")
+
+        assert self.journal.get_meta("format") == "json"
+        assert self.journal.outputs() == {"a.md": "out/a.md", "b.md": "out/b.md"}
+
+        self.journal.reset()
+        assert self.journal.get_meta("format") is None
+        assert self.journal.outputs() == {}
+
+
+def test_batch_resume_does_not_repeat_llm_calls(tmp_path, monkeypatch):
+    """Test that --resume only retries unfinished inputs."""
+    calls = []
+    fail = {"b": True}
+
+    def parse_with_llm(self, content):
+        calls.append(content)
+        if "b" in content and fail["b"]:
+            raise RuntimeError("provider down")
+        return self._parse_ftl_markdown(FTL_OUTPUT)
+
+    monkeypatch.setattr(DocumentParser, "parse_with_llm", parse_with_llm)
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.txt").write_text(f"input {name}")
+    sources = [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]
+    output_dir = tmp_path / "out"
+    runner = CliRunner()
+
+    result = runner.invoke(cli.main, ["batch", *sources, "-d", str(output_dir)])
+    assert result.exit_code == 1
+    assert (output_dir / "a.md").exists()
+    assert len(calls) == 2
+
+    fail["b"] = False
+    result = runner.invoke(cli.main, ["batch", "--resume", "-d", str(output_dir)])
+    assert result.exit_code == 0
+    assert (output_dir / "b.md").read_text().startswith("# Converted")
+    assert calls == ["input a", "input b", "input b"]
+
+
+def test_batch_resume_reconverts_invalid_documents(tmp_path, monkeypatch):
+    """Test that --resume retries the LLM for documents that failed validation."""
+    outputs = ["# Converted\n\n## Requirements\n- nothing", FTL_OUTPUT]
+    calls = []
+
+    def parse_with_llm(self, content):
+        calls.append(content)
+        return self._parse_ftl_markdown(outputs[len(calls) - 1])
+
+    monkeypatch.setattr(DocumentParser, "parse_with_llm", parse_with_llm)
+    (tmp_path / "a.txt").write_text("input a")
+    output_dir = tmp_path / "out"
+    runner = CliRunner()
+
+    result = runner.invoke(cli.main, ["batch", str(tmp_path / "a.txt"), "-d", str(output_dir)])
+    assert result.exit_code == 1
+    assert not (output_dir / "a.md").exists()
+
+    result = runner.invoke(cli.main, ["batch", "--resume", "-d", str(output_dir)])
+    assert result.exit_code == 0
+    assert len(calls) == 2
+    assert (output_dir / "a.md").exists()
+
+
+def test_batch_resume_rejects_format_change(tmp_path, monkeypatch):
+    """Test that --resume refuses a format other than the journaled one."""
+    monkeypatch.setattr(
+        DocumentParser,
+        "parse_with_llm",
+        lambda self, content: self._parse_ftl_markdown(FTL_OUTPUT),
+    )
+    (tmp_path / "a.txt").write_text("input a")
+    output_dir = tmp_path / "out"
+    runner = CliRunner()
+
+    result = runner.invoke(
+        cli.main, ["batch", str(tmp_path / "a.txt"), "-d", str(output_dir)]
+    )
+    assert result.exit_code == 0
+
+    result = runner.invoke(
+        cli.main, ["batch", "--resume", "-d", str(output_dir), "-f", "json"]
+    )
+    assert result.exit_code == 2
+    assert "--format markdown" in result.output
+    assert not (output_dir / "a.json").exists()
+
+
+def test_batch_resume_new_source_keeps_journaled_outputs(tmp_path, monkeypatch):
+    """Test that a source added on --resume does not reuse a journaled path."""
+    monkeypatch.setattr(
+        DocumentParser,
+        "parse_with_llm",
+        lambda self, content: self._parse_ftl_markdown(f"# {content}\n" + FTL_OUTPUT),
+    )
+    for directory in ("x", "y"):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "a.txt").write_text(f"input {directory}")
+    output_dir = tmp_path / "out"
+    runner = CliRunner()
+
+    result = runner.invoke(
+        cli.main, ["batch", str(tmp_path / "x" / "a.txt"), "-d", str(output_dir)]
+    )
+    assert result.exit_code == 0
+    result = runner.invoke(
+        cli.main,
+        ["batch", "--resume", str(tmp_path / "y" / "a.txt"), "-d", str(output_dir)],
+    )
+    assert result.exit_code == 0
+
+    outputs = sorted(p.name for p in output_dir.glob("a*.md"))
+    assert len(outputs) == 2
+    assert (output_dir / "a.md").read_text().startswith("# input x")
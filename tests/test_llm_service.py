@@ -0,0 +1,212 @@
+"""Tests for LLM service request hedging."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from types import SimpleNamespace
+
+from click.testing import CliRunner
+from ftl_document import cli, llm_service
+from ftl_document.llm_service import LLMService
+
+from tests.samples import FTL_DOCUMENT
+
+
+def _response(text):
+    """Build a minimal litellm-style completion response."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))]
+    )
+
+
+class TestHedging:
+    """Test hedged requests in LLMService."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.delays = {"primary": 0.0, "secondary": 0.0}
+
+        def completion(model, messages, **kwargs):
+            time.sleep(self.delays[model])
+            return _response(f"# From {model}")
+
+        async def acompletion(model, messages, **kwargs):
+            await asyncio.sleep(self.delays[model])
+            return _response(f"# From {model}")
+
+        self.completion = completion
+        self.acompletion = acompletion
+
+    def _service(self, monkeypatch, **kwargs):
+        monkeypatch.setattr(llm_service.litellm, "completion", self.completion)
+        monkeypatch.setattr(llm_service.litellm, "acompletion", self.acompletion)
+        return LLMService(model="primary", **kwargs)
+
+    def test_no_hedge_by_default(self, monkeypatch):
+        """Test that hedging is opt-in."""
+        service = self._service(monkeypatch)
+        self.delays["primary"] = 0.05
+
+        assert service.transform_document("doc") == "# From primary"
+        assert service.hedge_stats["hedged"] == 0
+        assert service.hedge_rate == 0.0
+
+    def test_fast_primary_is_not_hedged(self, monkeypatch):
+        """Test that a primary answering within the delay is not duplicated."""
+        service = self._service(monkeypatch, hedge_model="secondary", hedge_delay=1.0)
+
+        assert service.transform_document("doc") == "# From primary"
+        assert service.hedge_stats["requests"] == 1
+        assert service.hedge_stats["hedged"] == 0
+
+    def test_slow_primary_is_hedged(self, monkeypatch):
+        """Test that the hedge wins when the primary is slow."""
+        service = self._service(monkeypatch, hedge_model="secondary", hedge_delay=0.01)
+        self.delays["primary"] = 0.3
+
+        assert service.transform_document("doc") == "# From secondary"
+        assert service.hedge_stats["hedged"] == 1
+        assert service.hedge_stats["hedge_wins"] == 1
+        assert service.hedge_rate == 1.0
+
+        # The primary keeps running in its thread; its finish records the saving
+        time.sleep(0.4)
+        assert service.hedge_stats["latency_saved"] > 0.1
+
+    def test_losing_primary_does_not_delay_exit(self):
+        """Test that the process exits without waiting for a losing primary."""
+        script = textwrap.dedent(
+            """
+            import time
+            from types import SimpleNamespace
+            from ftl_document import llm_service
+
+            def completion(model, messages, **kwargs):
+                time.sleep(60 if model == "primary" else 0.05)
+                message = SimpleNamespace(content="# From " + model)
+                return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+            llm_service.litellm.completion = completion
+            service = llm_service.LLMService(
+                model="primary", hedge_model="secondary", hedge_delay=0.1
+            )
+            print(service.transform_document("doc"))
+            """
+        )
+        start = time.monotonic()
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            timeout=50,
+            env={**os.environ, "LITELLM_LOCAL_MODEL_COST_MAP": "True"},
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "# From secondary"
+        assert time.monotonic() - start < 45
+
+    def test_failed_hedge_falls_back_to_primary(self, monkeypatch):
+        """Test that an invalid hedge response does not win."""
+        service = self._service(monkeypatch, hedge_model="secondary", hedge_delay=0.01)
+        self.delays["primary"] = 0.1
+
+        def completion(model, messages, **kwargs):
+            if model == "secondary":
+                return _response("")
+            return self.completion(model, messages, **kwargs)
+
+        monkeypatch.setattr(llm_service.litellm, "completion", completion)
+
+        assert service.transform_document("doc") == "# From primary"
+        assert service.hedge_stats["hedge_wins"] == 0
+
+    def test_delay_uses_latency_percentile(self, monkeypatch):
+        """Test that the hedge delay follows recent primary latencies."""
+        service = self._service(monkeypatch, hedge_model="secondary", hedge_delay=5.0)
+        assert service.hedge_delay_seconds() == 5.0
+
+        service._latencies.extend(float(i) for i in range(1, 21))
+        assert service.hedge_delay_seconds() == 19.0
+
+    def test_async_hedge_cancels_loser(self, monkeypatch):
+        """Test that the async path returns the hedge and cancels the primary."""
+        service = self._service(monkeypatch, hedge_model="secondary", hedge_delay=0.01)
+        self.delays["primary"] = 5.0
+
+        start = time.monotonic()
+        result = asyncio.run(service.atransform_document("doc"))
+
+        assert result == "# From secondary"
+        assert time.monotonic() - start < 1.0
+        assert service.hedge_stats["hedge_wins"] == 1
+
+    def test_async_cancelled_primary_records_lower_bounds(self, monkeypatch):
+        """Test that a cancelled async primary still feeds latency statistics."""
+        service = self._service(monkeypatch, hedge_model="secondary", hedge_delay=0.05)
+        self.delays["primary"] = 5.0
+
+        async def run():
+            result = await service.atransform_document("doc")
+            # Longer than hedge_delay, so the losing primary is cancelled
+            await asyncio.sleep(0.2)
+            return result
+
+        assert asyncio.run(run()) == "# From secondary"
+        assert len(service._latencies) == 1
+        # Hedged at 0.05s, cancelled hedge_delay after the hedge won
+        assert 0.09 < service._latencies[0] < 0.5
+        assert 0.04 < service.hedge_stats["latency_saved"] < 0.5
+
+    def test_async_slow_primary_records_latency(self, monkeypatch):
+        """Test that an async primary finishing after the hedge is measured."""
+        service = self._service(monkeypatch, hedge_model="secondary", hedge_delay=0.1)
+        self.delays["primary"] = 0.15
+
+        async def run():
+            result = await service.atransform_document("doc")
+            await asyncio.sleep(0.3)
+            return result
+
+        assert asyncio.run(run()) == "# From secondary"
+        assert len(service._latencies) == 1
+        assert service._latencies[0] >= 0.15
+        assert 0.0 < service.hedge_stats["latency_saved"] < 0.1
+
+
+def test_batch_hedging_options_and_report(tmp_path, monkeypatch):
+    """Test that batch passes hedging options through and reports the stats."""
+    models = []
+
+    def completion(model, messages, **kwargs):
+        models.append(model)
+        if model == "primary":
+            time.sleep(0.2)
+        return _response(FTL_DOCUMENT)
+
+    monkeypatch.setattr(llm_service.litellm, "completion", completion)
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.txt").write_text(f"input {name}")
+    result = CliRunner().invoke(
+        cli.main,
+        [
+            "batch",
+            str(tmp_path / "a.txt"),
+            str(tmp_path / "b.txt"),
+            "-d",
+            str(tmp_path / "out"),
+            "-m",
+            "primary",
+            "--hedge-model",
+            "secondary",
+            "--hedge-delay",
+            "0.01",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert models.count("secondary") == 2
+    assert "Hedged 2 of 2 request(s) (100%); hedge won 2" in result.output
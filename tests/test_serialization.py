@@ -0,0 +1,91 @@
+"""Tests for document serialization and JSON Lines bulk export."""
+
+import io
+
+import pytest
+from ftl_document.core import FTLDocument
+from ftl_document.generator import DocumentGenerator
+from ftl_document.serialization import (
+    document_from_json,
+    document_from_yaml,
+    dumps_json,
+    format_for_path,
+    iter_jsonl,
+    load_document,
+    loads_json,
+    write_jsonl,
+)
+
+
+class TestSerialization:
+    """Test serialization helpers."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.generator = DocumentGenerator()
+        self.document = FTLDocument(
+            title="Install nginx",
+            dependencies=["Ubuntu 22.04"],
+            tools_required=["apt_tool"],
+            implementation_steps=["1. Install nginx", "2. Start nginx"],
+            produces=["A running web server"],
+            metadata={"source": "nginx.md", "pages": 2},
+        )
+
+    def test_json_round_trip(self):
+        """Test that generated JSON loads back without the LLM."""
+        text = self.generator.generate_json(self.document)
+        assert document_from_json(text) == self.document
+
+    def test_yaml_round_trip(self):
+        """Test that generated YAML loads back without the LLM."""
+        text = self.generator.generate_yaml(self.document)
+        assert "title: Install nginx" in text
+        assert document_from_yaml(text) == self.document
+
+    def test_markdown_round_trip(self):
+        """Test that generated markdown loads back without the LLM."""
+        text = self.generator.generate_markdown(self.document)
+        loaded = load_document(text, "markdown")
+        assert loaded.tools_required == self.document.tools_required
+        assert loaded.implementation_steps == self.document.implementation_steps
+
+    def test_jsonl_round_trip(self):
+        """Test bulk export and import of many documents in one stream."""
+        documents = [
+            self.document.model_copy(update={"title": f"Doc {i}"}) for i in range(3)
+        ]
+        stream = io.StringIO()
+
+        assert write_jsonl(documents, stream) == 3
+        assert stream.getvalue().count("\n") == 3
+
+        stream.seek(0)
+        assert list(iter_jsonl(stream)) == documents
+
+    def test_jsonl_reports_bad_line(self):
+        """Test that a corrupt line is reported with its line number."""
+        stream = io.StringIO(self.document.model_dump_json() + "\n\n{not json}\n")
+
+        with pytest.raises(ValueError, match="line 3"):
+            list(iter_jsonl(stream))
+
+    def test_save_jsonl(self, tmp_path):
+        """Test writing a JSON Lines file through the generator."""
+        path = tmp_path / "corpus.jsonl"
+
+        assert self.generator.save_jsonl(iter([self.document] * 2), str(path)) == 2
+        with path.open() as f:
+            assert len(list(iter_jsonl(f))) == 2
+
+    def test_plain_json(self):
+        """Test the generic JSON helpers."""
+        assert loads_json(dumps_json({"a": [1, "b"]})) == {"a": [1, "b"]}
+
+    def test_format_for_path(self):
+        """Test format detection from file names."""
+        assert format_for_path("doc.JSON") == "json"
+        assert format_for_path("doc.yml") == "yaml"
+        assert format_for_path("corpus.jsonl") == "jsonl"
+        assert format_for_path("doc.md") == "markdown"
+        assert format_for_path("doc.txt") is None
@@ -0,0 +1,195 @@
+"""Tests for chunked input readers and streaming stdin/stdout."""
+
+import io
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+from ftl_document import cli
+from ftl_document.core import DocumentParser
+from ftl_document.streams import (
+    SNIFF_SIZE,
+    iter_chunks,
+    iter_file_chunks,
+    iter_lines,
+    iter_text,
+    split_head,
+)
+from ftl_document.tracing import get_tracer
+
+from tests.samples import FTL_DOCUMENT, docx_paragraph, write_docx
+
+
+class TestReaders:
+    """Test the chunked reader helpers."""
+
+    def test_iter_chunks(self):
+        """Test that a stream is read in fixed size chunks."""
+        chunks = list(iter_chunks(io.BytesIO(b"abcdefg"), size=3))
+
+        assert chunks == [b"abc", b"def", b"g"]
+
+    def test_iter_file_chunks(self, tmp_path):
+        """Test reading a file through a memory map."""
+        path = tmp_path / "input.txt"
+        path.write_bytes(b"x" * 10)
+        empty = tmp_path / "empty.txt"
+        empty.write_bytes(b"")
+
+        assert list(iter_file_chunks(str(path), size=4)) == [b"xxxx", b"xxxx", b"xx"]
+        assert list(iter_file_chunks(str(empty))) == []
+
+    def test_iter_file_chunks_from_pipe(self, tmp_path):
+        """Test reading a path that is a pipe, as with <(curl ...)."""
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"piped input")
+        os.close(write_fd)
+        try:
+            chunks = list(iter_file_chunks(f"/dev/fd/{read_fd}", size=4))
+        finally:
+            os.close(read_fd)
+
+        assert b"".join(chunks) == b"piped input"
+
+    def test_split_head(self):
+        """Test that the head is read ahead and the rest left unread."""
+        head, rest = split_head(iter([b"ab", b"cd", b"ef"]), size=3)
+
+        assert head == b"abcd"
+        assert list(rest) == [b"ef"]
+
+    def test_iter_text_joins_split_characters(self):
+        """Test decoding multi-byte characters split across chunks."""
+        data = "naïve café".encode("utf-8")
+        chunks = [data[i : i + 1] for i in range(len(data))]
+
+        assert "".join(iter_text(chunks)) == "naïve café"
+
+    def test_iter_lines(self):
+        """Test that lines spanning chunks are reassembled."""
+        text = ["fir", "st\nsec", "ond\n", "\nla", "st"]
+
+        assert list(iter_lines(text)) == "".join(text).split("\n")
+
+
+class TestParseChunks:
+    """Test DocumentParser.parse_chunks."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.parser = DocumentParser()
+        self.llm_inputs = []
+        self.parser.parse_with_llm = self.llm_inputs.append
+
+    def test_text_is_normalized(self):
+        """Test that chunked text reaches the LLM normalized."""
+        data = b"  Install nginx  \r\n\r\n\r\n\r\nthen start it\n\n"
+        self.parser.parse_chunks(iter_chunks(io.BytesIO(data), size=5))
+
+        assert self.llm_inputs == ["Install nginx\n\nthen start it"]
+
+    def test_empty_input_is_rejected(self):
+        """Test that empty input never reaches the LLM."""
+        with pytest.raises(ValueError):
+            self.parser.parse_chunks(iter_chunks(io.BytesIO(b" \n\n")))
+
+        assert self.llm_inputs == []
+
+    def test_html_is_preprocessed(self):
+        """Test that chunked HTML is converted before the LLM call."""
+        data = b"<html><body><h1>Guide</h1><p>Do it</p></body></html>"
+        self.parser.parse_chunks(iter_chunks(io.BytesIO(data), size=7))
+
+        assert self.llm_inputs == ["# Guide\n\nDo it"]
+
+    def test_ftl_skips_llm(self):
+        """Test that valid FTL input never reaches the LLM."""
+        data = FTL_DOCUMENT.encode("utf-8")
+        document = self.parser.parse_chunks(iter_chunks(io.BytesIO(data), size=16))
+
+        assert self.llm_inputs == []
+        assert document.title == "Install Nginx"
+
+    def test_ftl_beyond_sniffed_head_skips_llm(self):
+        """Test that FTL sections past the sniffed head are still detected."""
+        requirements = "".join(f"- Requirement {i}\n" for i in range(5000))
+        data = FTL_DOCUMENT.replace(
+            "## Requirements\n", "## Requirements\n" + requirements
+        ).encode("utf-8")
+        assert data.index(b"## Implementation Steps") > SNIFF_SIZE
+
+        document = self.parser.parse_chunks(iter_chunks(io.BytesIO(data)))
+
+        assert self.llm_inputs == []
+        assert len(document.dependencies) == 5001
+        assert len(document.implementation_steps) == 2
+
+    def test_docx_is_spooled(self, tmp_path):
+        """Test that DOCX bytes from a pipe are converted."""
+        path = write_docx(tmp_path / "doc.docx", docx_paragraph("Install", style="Title"))
+        with open(path, "rb") as f:
+            self.parser.parse_chunks(iter_chunks(f, size=64))
+
+        assert self.llm_inputs == ["# Install"]
+
+
+def test_generate_from_stdin_to_stdout(tmp_path, monkeypatch):
+    """Test using generate in a pipeline with - for stdin."""
+    runner = CliRunner()
+    get_tracer().clear()
+    # Restored after the test; --trace-file switches tracing on
+    monkeypatch.setattr(get_tracer(), "enabled", False)
+
+    result = runner.invoke(
+        cli.main,
+        ["generate", "-", "-f", "json", "--trace-file", str(tmp_path / "t.jsonl")],
+        input=FTL_DOCUMENT,
+    )
+
+    assert result.exit_code == 0, result.output
+    document = json.loads(result.stdout)
+    assert document["title"] == "Install Nginx"
+    assert "skipped the LLM" in result.stderr
+    assert [s.attributes for s in get_tracer().spans if s.name == "fetch"] == [
+        {"path": "-"}
+    ]
+
+
+def test_generate_from_url_closes_response(tmp_path, monkeypatch):
+    """Test that a streamed URL response is read in a fetch span and closed."""
+    closed = []
+
+    class Response:
+        encoding = "utf-8"
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            closed.append(True)
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, size):
+            yield FTL_DOCUMENT.encode("utf-8")
+
+    monkeypatch.setattr(cli.requests, "get", lambda *args, **kwargs: Response())
+    get_tracer().clear()
+    monkeypatch.setattr(get_tracer(), "enabled", False)
+
+    result = CliRunner().invoke(
+        cli.main,
+        [
+            "generate",
+            "https://example.com/doc",
+            "--trace-file",
+            str(tmp_path / "t.jsonl"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert closed == [True]
+    fetches = [s for s in get_tracer().spans if s.name == "fetch"]
+    assert len(fetches) == 2
@@ -0,0 +1,106 @@
+"""Tests for pipeline tracing and profiling."""
+
+import json
+import time
+
+import pytest
+from ftl_document.core import FTLDocument
+from ftl_document.generator import DocumentGenerator
+from ftl_document.tracing import Tracer, get_tracer, profile
+
+
+class TestTracer:
+    """Test Tracer class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.tracer = Tracer()
+
+    def test_nested_spans(self):
+        """Test that nested spans share a trace and link to their parent."""
+        with self.tracer.span("outer") as outer:
+            with self.tracer.span("inner", stage="parse") as inner:
+                pass
+
+        assert inner.trace_id == outer.trace_id
+        assert inner.parent_id == outer.span_id
+        assert outer.parent_id is None
+        assert inner.attributes == {"stage": "parse"}
+        assert set(self.tracer.summary()) == {"outer", "inner"}
+
+    def test_span_records_errors(self):
+        """Test that a failing block marks its span as an error."""
+        with pytest.raises(ValueError):
+            with self.tracer.span("failing"):
+                raise ValueError("boom")
+
+        span = self.tracer.spans[0]
+        assert span.error == "ValueError: boom"
+        assert span.to_otlp()["status"]["code"] == 2
+
+    def test_export_file(self, tmp_path):
+        """Test OTLP/JSON export to a local file."""
+        with self.tracer.span("stage", count=3):
+            pass
+
+        path = tmp_path / "trace.jsonl"
+        self.tracer.export_file(str(path))
+
+        payload = json.loads(path.read_text())
+        spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert spans[0]["name"] == "stage"
+        assert spans[0]["attributes"] == [
+            {"key": "count", "value": {"intValue": "3"}}
+        ]
+
+    def test_iter_span_times_only_reads(self):
+        """Test that iter_span records time spent inside the iterator."""
+
+        def slow_items():
+            for item in range(3):
+                time.sleep(0.01)
+                yield item
+
+        with self.tracer.span("outer") as outer:
+            items = self.tracer.iter_span("fetch", slow_items(), path="-")
+        for _ in items:
+            time.sleep(0.05)
+
+        fetch = [span for span in self.tracer.spans if span.name == "fetch"][0]
+        assert fetch.parent_id == outer.span_id
+        assert fetch.attributes == {"path": "-"}
+        assert 0.03 <= fetch.duration < 0.1
+
+    def test_disabled_tracer_records_nothing(self):
+        """Test that a disabled tracer skips recording entirely."""
+        tracer = Tracer(enabled=False)
+        with tracer.span("stage") as span:
+            pass
+        assert list(tracer.iter_span("fetch", [1, 2])) == [1, 2]
+
+        assert span is None
+        assert not tracer.spans
+        assert not get_tracer().enabled
+
+    def test_generator_is_traced(self, monkeypatch):
+        """Test that pipeline stages record spans on the default tracer."""
+        tracer = get_tracer()
+        tracer.clear()
+        monkeypatch.setattr(tracer, "enabled", True)
+
+        DocumentGenerator().generate_markdown(
+            FTLDocument(title="Traced", implementation_steps=["Step 1"])
+        )
+
+        assert "generator.render" in tracer.summary()
+
+
+def test_profile_writes_reports(tmp_path):
+    """Test that profile dumps cProfile and tracemalloc reports."""
+    prefix = tmp_path / "run"
+    with profile(str(prefix)):
+        sum(range(1000))
+
+    assert (tmp_path / "run.prof").exists()
+    report = (tmp_path / "run.txt").read_text()
+    assert "allocation sites" in report